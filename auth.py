@@ -0,0 +1,153 @@
+# auth.py
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+# scrypt cost parameters: ~16 MB and tens of milliseconds per hash
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+
+SESSION_TTL = 8 * 60 * 60  # seconds a login stays valid
+# Set BARBER_SHOP_SECRET when running several server processes so they accept each other's tokens
+SECRET_KEY = os.environ.get("BARBER_SHOP_SECRET", "").encode() or secrets.token_bytes(32)
+
+MAX_FAILED_LOGINS = 5  # per username and per session within LOGIN_WINDOW
+LOGIN_WINDOW = 5 * 60  # seconds
+MAX_TRACKED_LOGIN_KEYS = 10000  # keys with recent failures kept in memory; the least recent are dropped first
+MAX_CONCURRENT_LOGINS = 4  # scrypt checks allowed to run at once in this process
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def hash_password(password, salt=None):
+    """Return a salted scrypt hash of password as "scrypt$n$r$p$salt$hash"."""
+    salt = salt or secrets.token_bytes(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_DKLEN)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def is_hashed(stored):
+    return bool(stored) and stored.startswith("scrypt$")
+
+
+def verify_password(password, stored):
+    """
+    Check password against a stored value.
+    Returns:
+        tuple: (matches, needs_rehash). needs_rehash is True for legacy plaintext
+        values and hashes made with older cost parameters.
+    """
+    if not stored:
+        return False, False
+    if not is_hashed(stored):  # Legacy plaintext row
+        return hmac.compare_digest(password.encode(), stored.encode()), True
+    _, n, r, p, salt, expected = stored.split("$")
+    digest = hashlib.scrypt(password.encode(), salt=_b64decode(salt), n=int(n), r=int(r), p=int(p),
+                            dklen=len(_b64decode(expected)))
+    matches = hmac.compare_digest(digest, _b64decode(expected))
+    return matches, matches and (int(n), int(r), int(p)) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+# Hash checked when the username does not exist, so both cases take the same time
+_DUMMY_HASH = hash_password(secrets.token_hex(8))
+
+
+def verify_dummy(password):
+    verify_password(password, _DUMMY_HASH)
+
+
+def issue_token(user, ttl=SESSION_TTL):
+    """Return a signed token carrying the user's id, login, name and role until it expires."""
+    payload = {"id": user["id"], "login": user["login"], "name": user["name"], "role": user["role"],
+               "exp": int(time.time()) + ttl}
+    body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    signature = _b64encode(hmac.new(SECRET_KEY, body.encode(), hashlib.sha256).digest())
+    return f"{body}.{signature}"
+
+
+def verify_token(token):
+    """Return the user dict carried by token, or None if it is missing, forged or expired. No database access."""
+    if not token or "." not in token:
+        return None
+    body, signature = token.rsplit(".", 1)
+    expected = _b64encode(hmac.new(SECRET_KEY, body.encode(), hashlib.sha256).digest())
+    if not hmac.compare_digest(signature, expected):
+        return None
+    try:
+        payload = json.loads(_b64decode(body))
+    except ValueError:
+        return None
+    if payload.get("exp", 0) < time.time():
+        return None
+    return payload
+
+
+class LoginRateLimiter:
+    """
+    Sliding-window count of failed logins per key (a username or a browser session).
+    Keys whose failures have all expired are swept at most once per window, and at
+    most max_keys are tracked, so cycling through made-up usernames cannot grow it without limit.
+    """
+
+    def __init__(self, max_failures=MAX_FAILED_LOGINS, window=LOGIN_WINDOW, max_keys=MAX_TRACKED_LOGIN_KEYS):
+        self.max_failures = max_failures
+        self.window = window
+        self.max_keys = max_keys
+        self._failures = OrderedDict()  # key -> failure times, least recently failed first
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def retry_after(self, *keys):
+        """Seconds until any of keys may try again, or 0 if none is locked out."""
+        now = time.monotonic()
+        wait = 0
+        with self._lock:
+            for key in keys:
+                failures = self._failures.get(key)
+                if not failures:
+                    continue
+                while failures and now - failures[0] > self.window:
+                    failures.popleft()
+                if len(failures) >= self.max_failures:
+                    wait = max(wait, self.window - (now - failures[0]))
+                elif not failures:
+                    del self._failures[key]
+        return int(wait) + 1 if wait else 0
+
+    def record_failure(self, *keys):
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                for key in [key for key, failures in self._failures.items() if now - failures[-1] > self.window]:
+                    del self._failures[key]
+                self._next_sweep = now + self.window
+            for key in keys:
+                self._failures.setdefault(key, deque()).append(now)
+                self._failures.move_to_end(key)
+            while len(self._failures) > self.max_keys:
+                self._failures.popitem(last=False)
+
+    def reset(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._failures.pop(key, None)
+
+
+login_limiter = LoginRateLimiter()
+# Bounds CPU spent on scrypt even when many sessions hammer the login button
+login_slots = threading.BoundedSemaphore(MAX_CONCURRENT_LOGINS)
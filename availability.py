@@ -0,0 +1,257 @@
+# availability.py
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import db
+import metrics
+
+
+# Working hours given to new barbers, and the booking grid
+DEFAULT_OPENING_TIME = "09:00"
+DEFAULT_CLOSING_TIME = "18:00"
+DEFAULT_DURATION = 30  # minutes, for services without a duration
+SLOT_STEP = 15  # minutes between bookable start times
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+CACHE_TTL = 30  # seconds (see README, "Caches and several server processes")
+CACHE_MAX_DATES = 400
+
+
+def to_minutes(hhmm):
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def to_hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def end_time(start, duration):
+    """HH:MM at which an appointment starting at start and lasting duration minutes ends."""
+    return to_hhmm(min(to_minutes(start) + duration, 24 * 60 - 1))
+
+
+class AvailabilityCache:
+    """
+    Process-wide map of date -> {barber_id: sorted busy (start, end) minute intervals}.
+    Writers call invalidate(date) after committing, and a generation counter
+    stops a load that raced with an invalidation from caching stale intervals.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_dates=CACHE_MAX_DATES):
+        self.ttl = ttl
+        self.max_dates = max_dates
+        self._entries = OrderedDict()  # date -> (busy, loaded_at)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, date):
+        with self._lock:
+            entry = self._entries.get(date)
+            if entry and time.monotonic() - entry[1] < self.ttl:
+                self._entries.move_to_end(date)
+                return entry[0]
+            generation = self._generation
+        busy = _load_busy(date)
+        self.put(date, busy, generation)
+        return busy
+
+    def get_many(self, dates):
+        """Return ({date: busy} for fresh cached dates, generation) without loading anything."""
+        hits = {}
+        with self._lock:
+            now = time.monotonic()
+            for date in dates:
+                entry = self._entries.get(date)
+                if entry and now - entry[1] < self.ttl:
+                    hits[date] = entry[0]
+            return hits, self._generation
+
+    def put(self, date, busy, generation):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[date] = (busy, time.monotonic())
+            self._entries.move_to_end(date)
+            while len(self._entries) > self.max_dates:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *dates):
+        with self._lock:
+            self._generation += 1
+            for date in dates:
+                self._entries.pop(date, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+def busy_from_rows(rows):
+    """Group (barber_id, start HH:MM, end HH:MM) rows into sorted minute intervals per barber."""
+    busy = {}
+    for barber_id, start, end in rows:
+        busy.setdefault(barber_id, []).append((to_minutes(start), to_minutes(end)))
+    for intervals in busy.values():
+        intervals.sort()
+    return busy
+
+
+@metrics.timed("db")
+def _load_busy(date):
+    with db.connection() as conn:
+        rows = conn.execute("SELECT barber_id, time, end_time FROM appointments WHERE date = ?", (date,)).fetchall()
+    return busy_from_rows(rows)
+
+
+_cache = AvailabilityCache()
+
+
+def invalidate(*dates):
+    """Drop cached availability for the given dates (YYYY-MM-DD strings or dates)."""
+    _cache.invalidate(*(db.normalize_date(d) for d in dates))
+
+
+# Barbers and their working hours change rarely and are cached separately
+_barbers = None
+_barbers_loaded_at = 0.0
+_barbers_lock = threading.Lock()
+
+
+@metrics.timed("db")
+def _load_barber_hours():
+    with db.connection() as conn:
+        return conn.execute("""
+            SELECT u.id, COALESCE(u.name, u.login), h.weekday, h.start_time, h.end_time
+            FROM barber_hours h JOIN user_access_data u ON u.id = h.barber_id
+            ORDER BY u.id, h.weekday
+        """).fetchall()
+
+
+def get_barbers():
+    """
+    Return {barber_id: {"name": str, "hours": {weekday: (start, end) minutes}}}.
+    A barber is any user with working hours; weekday 0 is Monday.
+    """
+    global _barbers, _barbers_loaded_at
+    with _barbers_lock:
+        if _barbers is not None and time.monotonic() - _barbers_loaded_at < CACHE_TTL:
+            return _barbers
+    barbers = {}
+    for barber_id, name, weekday, start, end in _load_barber_hours():
+        barber = barbers.setdefault(barber_id, {"name": name, "hours": {}})
+        barber["hours"][weekday] = (to_minutes(start), to_minutes(end))
+    with _barbers_lock:
+        _barbers, _barbers_loaded_at = barbers, time.monotonic()
+    return barbers
+
+
+def invalidate_barbers():
+    global _barbers
+    with _barbers_lock:
+        _barbers = None
+
+
+def clear_cache():
+    _cache.clear()
+    invalidate_barbers()
+
+
+def free_starts(busy, opening, closing, duration, not_before=0):
+    """
+    Return the start minutes, on the SLOT_STEP grid, of every gap in one barber's
+    day long enough for duration. busy must be sorted; a single sweep visits each
+    interval once.
+    """
+    starts = []
+    cursor = max(opening, not_before)
+    for busy_start, busy_end in list(busy) + [(closing, closing)]:
+        start = -(-cursor // SLOT_STEP) * SLOT_STEP  # Round up onto the grid
+        gap_end = min(busy_start, closing)
+        while start + duration <= gap_end:
+            starts.append(start)
+            start += SLOT_STEP
+        cursor = max(cursor, busy_end)
+        if cursor >= closing:
+            break
+    return starts
+
+
+def _day_availability(date, busy, duration, now, holds=None, barber_id=None):
+    # {start minute: [free barber ids]} across every barber working that day
+    weekday = datetime.fromisoformat(date).weekday()
+    not_before = 0
+    if date == now.strftime(db.DATE_FORMAT):
+        not_before = now.hour * 60 + now.minute + 1  # Only slots that have not started yet
+    free = {}
+    for bid, barber in get_barbers().items():
+        if barber_id is not None and bid != barber_id:
+            continue
+        hours = barber["hours"].get(weekday)
+        if not hours:
+            continue
+        intervals = busy.get(bid, [])
+        if holds and holds.get(bid):
+            intervals = sorted(intervals + holds[bid])
+        for start in free_starts(intervals, hours[0], hours[1], duration, not_before):
+            free.setdefault(start, []).append(bid)
+    return {to_hhmm(start): free[start] for start in sorted(free)}
+
+
+def day_availability(date, duration=DEFAULT_DURATION, now=None, holds=None, barber_id=None):
+    """
+    Return {HH:MM: [barber ids free for duration minutes from then]} for date,
+    computed in memory from the cached busy intervals. holds maps barber ids to
+    extra busy (start, end) minute intervals, e.g. slots held by other customers.
+    """
+    date = db.normalize_date(date)
+    return _day_availability(date, _cache.get(date), duration, now or datetime.now(), holds, barber_id)
+
+
+def free_slots(date, duration=DEFAULT_DURATION, now=None, holds=None, barber_id=None):
+    """Return the HH:MM start times on date at which at least one barber is free, in order."""
+    return list(day_availability(date, duration, now, holds, barber_id))
+
+
+@metrics.timed("db")
+def _load_range(dates):
+    # {date: [(barber_id, start, end)]} for every date in dates, a sorted run of consecutive days
+    rows = {d: [] for d in dates}
+    with db.connection() as conn:
+        for date, *row in conn.execute("""
+            SELECT date, barber_id, time, end_time FROM appointments WHERE date BETWEEN ? AND ?
+        """, (dates[0], dates[-1])):
+            if date in rows:
+                rows[date].append(row)
+    return rows
+
+
+def range_availability(start, days, duration=DEFAULT_DURATION, now=None, barber_id=None):
+    """
+    Return {YYYY-MM-DD: day_availability(...)} for days consecutive dates from start.
+    Dates missing from the cache are loaded with a single range query over the
+    (date, barber_id, time) index and cached, so a whole week costs at most one round trip.
+    """
+    start = datetime.strptime(db.normalize_date(start), db.DATE_FORMAT).date()
+    dates = [(start + timedelta(days=i)).strftime(db.DATE_FORMAT) for i in range(days)]
+    busy, generation = _cache.get_many(dates)
+    missing = [d for d in dates if d not in busy]
+    if missing:
+        for date, day_rows in _load_range(missing).items():
+            busy[date] = busy_from_rows(day_rows)
+            _cache.put(date, busy[date], generation)
+    now = now or datetime.now()
+    return {d: _day_availability(d, busy[d], duration, now, barber_id=barber_id) for d in dates}
+
+
+def next_free_slots(start, limit=5, days=14, duration=DEFAULT_DURATION, now=None, barber_id=None):
+    """Return up to limit (date, HH:MM) pairs of the earliest open slots from start, searching days dates ahead."""
+    found = []
+    for date, slots in range_availability(start, days, duration, now, barber_id).items():
+        for slot in slots:
+            found.append((date, slot))
+            if len(found) >= limit:
+                return found
+    return found
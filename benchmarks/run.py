@@ -0,0 +1,267 @@
+# benchmarks/run.py
+"""
+Benchmark the booking and management paths against synthetic shops.
+
+    python benchmarks/run.py --sizes 10000 100000 1000000 --baseline benchmarks/results/previous.json
+
+Each size is measured in a fresh process with its own database (BARBER_SHOP_DB)
+and working directory, so process-wide caches and pools start cold. Results are
+written as JSON; with --baseline, any median that got slower than the baseline
+by more than --tolerance is reported and the exit status is 1.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = (10000, 100000)
+MIN_REGRESSION_MS = 1.0  # Ignore slowdowns smaller than this; they are timer noise
+
+
+def _stats(times):
+    times = sorted(times)
+    return {
+        "runs": len(times),
+        "min_ms": round(times[0] * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 3),
+        "mean_ms": round(statistics.fmean(times) * 1000, 3),
+    }
+
+
+def measure(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return _stats(times)
+
+
+def bench_data_access(repeat):
+    import availability
+    import catalog
+    import export
+    import reports
+    from data import appointments, customers, gallery, services
+    from views.gallery import GALLERY_PAGE_SIZE
+
+    today = date.today()
+    month_ago = today - timedelta(days=30)
+    year_ago = today - timedelta(days=365)
+    full_scan = max(1, repeat // 10)  # Calls that read the whole table
+    return {
+        "get_booked_times": measure(lambda: appointments.get_booked_times(today), repeat),
+        "get_appointments": measure(appointments.get_appointments, full_scan),
+        "query_appointments_page": measure(lambda: appointments.query_appointments(start_date=today, limit=50), repeat),
+        "count_appointments": measure(lambda: appointments.count_appointments(start_date=today), repeat),
+        "get_services": measure(services.get_services, repeat),
+        "catalog_warm": measure(catalog.get_catalog, repeat),
+        "range_availability_cold": measure(lambda: availability.range_availability(today, 7), repeat,
+                                           setup=availability.clear_cache),
+        "range_availability_warm": measure(lambda: availability.range_availability(today, 7), repeat),
+        "search_customers": measure(lambda: customers.search_customers("customer1"), repeat),
+        "get_gallery_images": measure(lambda: gallery.get_gallery_images(GALLERY_PAGE_SIZE), repeat),
+        "reports_daily_totals_30d": measure(lambda: reports.daily_totals(month_ago, today), repeat),
+        "reports_by_barber_365d": measure(lambda: reports.totals_by_barber(year_ago, today), repeat),
+        "export_csv_30d": measure(lambda: export.export("appointments", "csv", io.BytesIO(), month_ago, today),
+                                  full_scan),
+    }
+
+
+def bench_pages(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=120).run()
+    results = {}
+
+    def render(label):
+        at.sidebar.radio[0].set_value(label).run()
+        if at.exception:
+            raise RuntimeError(f"{label} page failed: {at.exception[0].value}")
+
+    for label in ("Home", "Services", "Book Appointment", "Gallery"):
+        render(label)  # First render warms the caches
+        results[label] = measure(lambda: render(label), repeat)
+
+    at.sidebar.text_input[0].set_value("manager")
+    at.sidebar.text_input[1].set_value("password123")
+    at.sidebar.button[0].click().run()
+    for label in ("Manage Appointments", "Reports"):
+        render(label)
+        results[label] = measure(lambda: render(label), repeat)
+    return results
+
+
+def bench_concurrent_booking(threads, bookings_per_thread, seed=0):
+    """
+    Book random slots from several threads at once, like simultaneous customers, in
+    the two weeks after the seeded bookings end so most attempts contend for free slots.
+    """
+    import availability
+    import catalog
+    import db
+    from benchmarks.seed import FUTURE_DAYS
+    from data.appointments import reserve_slot
+
+    services = list(catalog.get_catalog())
+    times = [availability.to_hhmm(m) for m in range(9 * 60, 18 * 60, availability.SLOT_STEP)]
+    start_day = date.today() + timedelta(days=FUTURE_DAYS + 1)
+    latencies, outcomes, errors = [], {}, []
+    lock = threading.Lock()
+
+    def booker(index):
+        rng = random.Random(seed * 1000 + index)
+        for i in range(bookings_per_thread):
+            day = start_day + timedelta(days=rng.randrange(14))
+            started = time.perf_counter()
+            try:
+                result = reserve_slot(f"Load {index}-{i}", f"load{index}@example.com", rng.choice(services),
+                                      day, rng.choice(times))
+                status = result["status"]
+            except Exception as e:  # Recorded; a booking under load must never raise
+                status = "error"
+                errors.append(repr(e))
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                outcomes[status] = outcomes.get(status, 0) + 1
+
+    workers = [threading.Thread(target=booker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    with db.connection() as conn:
+        double_bookings = conn.execute("""
+            SELECT COUNT(*) FROM appointments a JOIN appointments b
+                ON a.date = b.date AND a.barber_id = b.barber_id AND a.id < b.id
+                AND a.time < b.end_time AND b.time < a.end_time
+            WHERE a.date >= ?
+        """, (start_day.isoformat(),)).fetchone()[0]
+    return {
+        "threads": threads,
+        "attempts": len(latencies),
+        "outcomes": outcomes,
+        "errors": errors[:10],
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        "latency": _stats(latencies),
+        "double_bookings": double_bookings,
+    }
+
+
+def run_size(args):
+    """Seed a shop of args.worker appointments in the current directory and measure it; prints JSON."""
+    sys.path.insert(0, ROOT)
+    from benchmarks.seed import seed_shop
+
+    started = time.perf_counter()
+    shop = seed_shop(args.worker, services=args.services, barbers=args.barbers, gallery_images=args.images)
+    shop["seed_seconds"] = round(time.perf_counter() - started, 2)
+    shop["db_bytes"] = sum(os.path.getsize(path) for path in (os.environ["BARBER_SHOP_DB"], os.environ["BARBER_SHOP_DB"] + "-wal")
+                           if os.path.exists(path))
+    result = {
+        "shop": shop,
+        "data_access": bench_data_access(args.repeat),
+        "pages": bench_pages(max(1, args.repeat // 4)),
+        "concurrent_booking": bench_concurrent_booking(args.threads, args.bookings),
+    }
+    print(json.dumps(result))
+
+
+def compare(results, baseline, tolerance):
+    """Return a line for every median that is slower than in baseline by more than tolerance."""
+    regressions = []
+    for size, current in results["sizes"].items():
+        previous = baseline.get("sizes", {}).get(size)
+        if not previous:
+            continue
+        for group in ("data_access", "pages"):
+            for name, stats in current[group].items():
+                old = previous.get(group, {}).get(name)
+                if not old:
+                    continue
+                slower = stats["median_ms"] - old["median_ms"]
+                if slower > MIN_REGRESSION_MS and stats["median_ms"] > old["median_ms"] * (1 + tolerance):
+                    regressions.append(f"{size} appointments, {group}.{name}: "
+                                       f"{old['median_ms']:.1f} ms -> {stats['median_ms']:.1f} ms")
+        if current["concurrent_booking"]["double_bookings"]:
+            regressions.append(f"{size} appointments: {current['concurrent_booking']['double_bookings']} double bookings")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="appointments per synthetic shop")
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--barbers", type=int, default=10)
+    parser.add_argument("--images", type=int, default=200, help="gallery images")
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per data-access benchmark")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent bookers")
+    parser.add_argument("--bookings", type=int, default=25, help="booking attempts per booker")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a regression (0.25 = 25%%)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker is not None:
+        return run_size(args)
+
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "sizes": {},
+    }
+    for size in args.sizes:
+        print(f"Seeding and measuring {size} appointments...", file=sys.stderr)
+        with tempfile.TemporaryDirectory() as workdir:
+            # The home page banner ships with the repo; everything else is seeded
+            shutil.copytree(os.path.join(ROOT, "uploads", "main_page"), os.path.join(workdir, "uploads", "main_page"))
+            env = dict(os.environ, BARBER_SHOP_DB=os.path.join(workdir, "barber_shop.db"))
+            command = [sys.executable, os.path.abspath(__file__), "--worker", str(size), "--services", str(args.services),
+                       "--barbers", str(args.barbers), "--images", str(args.images), "--repeat", str(args.repeat),
+                       "--threads", str(args.threads), "--bookings", str(args.bookings)]
+            completed = subprocess.run(command, cwd=workdir, env=env, stdout=subprocess.PIPE, text=True, check=True)
+        results["sizes"][str(size)] = json.loads(completed.stdout.strip().splitlines()[-1])
+        for group in ("data_access", "pages"):
+            for name, stats in results["sizes"][str(size)][group].items():
+                print(f"  {group}.{name}: median {stats['median_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms",
+                      file=sys.stderr)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/seed.py
+import io
+import random
+from datetime import date, timedelta
+from PIL import Image
+import availability
+import catalog
+import db
+import images
+import migrations
+from data.gallery import add_gallery_image
+from data.services import add_service
+from data.users import insert_employee_access
+
+
+DURATIONS = (15, 30, 45, 60)
+SEED_BATCH_SIZE = 10000
+FUTURE_DAYS = 30  # Seeded bookings end this many days after today
+
+
+def _image_bytes(rng, size=64):
+    image = Image.new("RGB", (size, size), tuple(rng.randrange(256) for _ in range(3)))
+    image.putpixel((rng.randrange(size), rng.randrange(size)), (255, 255, 255))  # Unique content per image
+    data = io.BytesIO()
+    image.save(data, "PNG")
+    return data.getvalue()
+
+
+def seed_shop(appointments, services=20, barbers=10, gallery_images=200, seed=0):
+    """
+    Fill the database at BARBER_SHOP_DB (relative upload paths use the current
+    directory) with a synthetic shop: barbers working 09:00-18:00 every day,
+    services with images, gallery images and appointments packed back to back
+    for every barber, going back in time from FUTURE_DAYS ahead until appointments
+    rows exist. About one customer in five books repeatedly.
+    Returns {"appointments": n, "first_date": ..., "last_date": ...}.
+    """
+    rng = random.Random(seed)
+    migrations.migrate()
+
+    for i in range(1, barbers):  # The seeded manager is the first barber
+        insert_employee_access(f"Barber {i}", "password", f"119{i:08d}", f"barber{i}@example.com")
+    processed = images.save_upload(_image_bytes(rng, 256), "uploads/services")
+    for i in range(services):
+        add_service(f"Service {i}", f"Synthetic service number {i}", f"${rng.randrange(10, 80)}",
+                    processed.paths["display"], rng.choice(DURATIONS))
+    for i in range(gallery_images):
+        add_gallery_image(images.save_upload(_image_bytes(rng), "uploads/gallery"), f"Picture {i}")
+
+    customers = max(1, appointments // 5)
+    with db.transaction() as conn:
+        first_customer = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM customers").fetchone()[0]
+        conn.executemany("INSERT INTO customers (contact_key, contact, name, name_key) VALUES (?, ?, ?, ?)",
+                         ((f"customer{i}@example.com", f"customer{i}@example.com", f"Customer {i}", f"customer {i}")
+                          for i in range(customers)))
+
+    shop_services = [(s.name, s.duration, s.price_cents) for s in catalog.get_catalog().values()]
+    barber_hours = {barber_id: barber["hours"] for barber_id, barber in availability.get_barbers().items()}
+    if not any(barber_hours.values()):
+        raise ValueError("No barber has working hours to seed appointments into")
+    day = date.today() + timedelta(days=FUTURE_DAYS)
+    last_date, rows, seeded = day, [], 0
+    while seeded < appointments:
+        for barber_id, hours in barber_hours.items():
+            if day.weekday() not in hours:
+                continue
+            start, closing = hours[day.weekday()]
+            while seeded < appointments:
+                service, duration, price_cents = rng.choice(shop_services)
+                if start + duration > closing:
+                    break
+                customer = rng.randrange(customers)
+                rows.append((f"Customer {customer}", f"customer{customer}@example.com", service, day.isoformat(),
+                             availability.to_hhmm(start), availability.to_hhmm(start + duration), barber_id,
+                             first_customer + customer, price_cents))
+                start += duration
+                seeded += 1
+        if len(rows) >= SEED_BATCH_SIZE or seeded >= appointments:
+            with db.transaction() as conn:
+                conn.executemany("""
+                    INSERT INTO appointments (name, contact, service, date, time, end_time, barber_id, customer_id,
+                                              price_cents)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+            rows = []
+        day -= timedelta(days=1)
+    availability.clear_cache()
+    return {"appointments": seeded, "first_date": (day + timedelta(days=1)).isoformat(),
+            "last_date": last_date.isoformat()}
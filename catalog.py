@@ -0,0 +1,68 @@
+# catalog.py
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+import db
+import metrics
+
+
+Service = namedtuple("Service", ["id", "name", "description", "price", "image_path", "duration", "price_cents"])
+
+CACHE_TTL = 60  # seconds (see README, "Caches and several server processes")
+
+
+class ServicesCatalog:
+    """
+    Process-wide snapshot of the services table keyed by name.
+    Writers call invalidate() after committing, which bumps the version; the next
+    reader reloads once and every other page render is served from memory.
+    """
+
+    def __init__(self, ttl=CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._services = None
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._loaded_version == self.version and time.monotonic() - self._loaded_at < self.ttl:
+                return self._services
+            version = self.version
+        services = _load()
+        with self._lock:
+            if version == self.version:  # Skip caching if a writer invalidated meanwhile
+                self._services, self._loaded_version, self._loaded_at = services, version, time.monotonic()
+        return services
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+
+
+@metrics.timed("db")
+def _load():
+    with db.connection() as conn:
+        rows = conn.execute("""
+            SELECT id, name, description, price, image_path, duration_minutes, price_cents FROM services ORDER BY id
+        """).fetchall()
+    return MappingProxyType({row[1]: Service(*row) for row in rows})
+
+
+_catalog = ServicesCatalog()
+
+
+def get_catalog():
+    """Return a read-only {name: Service} mapping of all services, in insertion order."""
+    return _catalog.get()
+
+
+def get_service(name):
+    return _catalog.get().get(name)
+
+
+def invalidate():
+    _catalog.invalidate()
@@ -0,0 +1,3 @@
+# data/__init__.py
+# Data-access helpers, one module per table group. Nothing here imports Streamlit,
+# so the CLI tools and benchmarks can use them without loading the UI.
@@ -0,0 +1,347 @@
+# data/appointments.py
+import csv
+import io
+import re
+from datetime import datetime
+import availability
+import catalog
+import db
+import metrics
+import notifications
+from data.customers import upsert_customer
+
+
+HOLD_SECONDS = 300  # How long a customer's chosen slot is held while they fill in the form
+
+# reserve_slot() results
+SLOT_BOOKED = "booked"
+SLOT_TAKEN = "taken"
+SLOT_HELD = "held"
+
+
+def _service_duration(service):
+    entry = catalog.get_service(service)
+    return entry.duration if entry else availability.DEFAULT_DURATION
+
+
+def _service_price_cents(service):
+    entry = catalog.get_service(service)
+    return entry.price_cents if entry else None
+
+
+def _barber_is_free(conn, barber_id, date, start, end, token=None, include_holds=True, exclude_id=None):
+    """Check, inside a transaction, that barber_id works and has no booking (or other session's hold) in [start, end)."""
+    weekday = datetime.fromisoformat(date).weekday()
+    hours = conn.execute("SELECT start_time, end_time FROM barber_hours WHERE barber_id = ? AND weekday = ?",
+                         (barber_id, weekday)).fetchone()
+    if not hours or start < hours[0] or end > hours[1]:
+        return False
+    if conn.execute("""
+        SELECT 1 FROM appointments
+        WHERE date = ? AND barber_id = ? AND time < ? AND end_time > ? AND id IS NOT ?
+    """, (date, barber_id, end, start, exclude_id)).fetchone():
+        return False
+    if include_holds and conn.execute("""
+        SELECT 1 FROM slot_holds
+        WHERE date = ? AND barber_id = ? AND time < ? AND end_time > ? AND expires_at > ? AND token IS NOT ?
+    """, (date, barber_id, end, start, datetime.now().timestamp(), token)).fetchone():
+        return False
+    return True
+
+
+def _find_free_barber(conn, date, start, end, token=None, barber_id=None, include_holds=True):
+    """Return barber_id, or the first barber free for [start, end), or None."""
+    if barber_id is not None:
+        candidates = [barber_id]
+    else:
+        candidates = [row[0] for row in conn.execute("SELECT DISTINCT barber_id FROM barber_hours ORDER BY barber_id")]
+    for candidate in candidates:
+        if _barber_is_free(conn, candidate, date, start, end, token, include_holds):
+            return candidate
+    return None
+
+
+@metrics.timed("db")
+def add_appointment(name, contact, service, date, time, barber_id=None):
+    """Book an appointment with barber_id, or the first free barber. Raises ValueError if nobody is free."""
+    result = reserve_slot(name, contact, service, date, time, barber_id=barber_id)
+    if result["status"] != SLOT_BOOKED:
+        raise ValueError(f"No barber is free on {date} at {time}")
+    return result["id"]
+
+
+# Slot reservation. A customer's session holds the slot it picked for HOLD_SECONDS
+# while they fill in the form, and reserve_slot() books it atomically: the
+# conflict check and the insert run under one write lock, so two sessions or
+# server processes can never book the same barber at overlapping times.
+@metrics.timed("db")
+def hold_slot(date, time, token, duration=availability.DEFAULT_DURATION, barber_id=None, seconds=HOLD_SECONDS):
+    """
+    Hold a slot with barber_id (or any free barber) for the session identified by token,
+    replacing any other hold the session has.
+    Returns the id of the barber held, or None if nobody is free.
+    """
+    date, time = db.normalize_date(date), db.normalize_time(time)
+    end = availability.end_time(time, duration)
+    now = datetime.now().timestamp()
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM slot_holds WHERE expires_at <= ? OR token = ?", (now, token))
+        held_barber = _find_free_barber(conn, date, time, end, token, barber_id)
+        if held_barber is not None:
+            conn.execute("""
+                INSERT INTO slot_holds (barber_id, date, time, end_time, token, expires_at) VALUES (?, ?, ?, ?, ?, ?)
+            """, (held_barber, date, time, end, token, now + seconds))
+    return held_barber
+
+
+@metrics.timed("db")
+def release_hold(token):
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM slot_holds WHERE token = ?", (token,))
+
+
+@metrics.timed("db")
+def get_holds(date, token=None):
+    """Return {barber_id: [(start, end) minutes]} held on date by sessions other than token."""
+    with db.connection() as conn:
+        rows = conn.execute("""
+            SELECT barber_id, time, end_time FROM slot_holds WHERE date = ? AND expires_at > ? AND token IS NOT ?
+        """, (db.normalize_date(date), datetime.now().timestamp(), token)).fetchall()
+    return availability.busy_from_rows(rows)
+
+
+@metrics.timed("db")
+def reserve_slot(name, contact, service, date, time, token=None, barber_id=None):
+    """
+    Book a slot with barber_id, or with any free barber (preferring the one token is holding).
+    The booking lasts the service's duration.
+    Returns:
+        dict: {"status": SLOT_BOOKED, "id": appointment id, "barber_id": barber id}, or
+        {"status": SLOT_TAKEN} / {"status": SLOT_HELD} when no barber is available.
+    """
+    date, time = db.normalize_date(date), db.normalize_time(time)
+    end = availability.end_time(time, _service_duration(service))
+    with db.transaction() as conn:
+        if barber_id is None and token:
+            held = conn.execute("SELECT barber_id FROM slot_holds WHERE token = ? AND date = ? AND time = ?",
+                                (token, date, time)).fetchone()
+            if held and _barber_is_free(conn, held[0], date, time, end, token):
+                barber_id = held[0]
+        chosen = _find_free_barber(conn, date, time, end, token, barber_id)
+        if chosen is None:
+            if _find_free_barber(conn, date, time, end, token, barber_id, include_holds=False) is not None:
+                return {"status": SLOT_HELD}
+            return {"status": SLOT_TAKEN}
+        appointment_id = conn.execute("""
+            INSERT INTO appointments (name, contact, service, date, time, barber_id, end_time, customer_id, price_cents)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (name, contact, service, date, time, chosen, end, upsert_customer(conn, name, contact),
+              _service_price_cents(service))).lastrowid
+        notifications.queue_booking(conn, appointment_id)  # Sent later by the worker, never during the booking
+        if token:
+            conn.execute("DELETE FROM slot_holds WHERE token = ?", (token,))
+    availability.invalidate(date)
+    notifications.wake()
+    return {"status": SLOT_BOOKED, "id": appointment_id, "barber_id": chosen}
+
+
+@metrics.timed("db")
+def remove_appoiments(id):    # Remove appointment by ID
+    with db.transaction() as conn:
+        row = conn.execute("SELECT date FROM appointments WHERE id = ?", (id,)).fetchone()
+        if row:
+            notifications.queue_cancellation(conn, id)
+        conn.execute("DELETE FROM appointments WHERE id = ?", (id,))
+    if row:
+        availability.invalidate(row[0])
+        notifications.wake()
+
+
+def delete_appointments(conn, ids):
+    """
+    Cancel appointments inside the caller's transaction, queueing a notice for each customer.
+    Returns (number removed, dates to invalidate once the transaction commits).
+    """
+    params = [(id,) for id in ids]
+    dates = set()
+    for param in params:
+        row = conn.execute("SELECT date FROM appointments WHERE id = ?", param).fetchone()
+        if row:
+            dates.add(row[0])
+            notifications.queue_cancellation(conn, param[0])
+    removed = conn.executemany("DELETE FROM appointments WHERE id = ?", params).rowcount
+    return removed, dates
+
+
+def upcoming_for_barber(conn, barber_id):
+    """Return (id, date, time, end_time) of barber_id's appointments that have not started yet."""
+    now = datetime.now()
+    return conn.execute("""
+        SELECT id, date, time, end_time FROM appointments
+        WHERE barber_id = ? AND (date > ? OR (date = ? AND time >= ?))
+        ORDER BY date, time
+    """, (barber_id, now.strftime(db.DATE_FORMAT), now.strftime(db.DATE_FORMAT), now.strftime(db.TIME_FORMAT))).fetchall()
+
+
+@metrics.timed("db")
+def remove_appointments(ids):
+    """Remove several appointments in a single transaction. Returns how many were removed."""
+    with db.transaction() as conn:
+        removed, dates = delete_appointments(conn, ids)
+    availability.invalidate(*dates)
+    notifications.wake()
+    return removed
+
+
+# Bulk appointment operations. Each runs as a single transaction and returns a
+# summary dict for the caller to report, instead of one rerun per row.
+@metrics.timed("db")
+def cancel_appointments_in_range(start_date, end_date):
+    """Remove every appointment from start_date to end_date inclusive. Returns {"cancelled": n}."""
+    start_date, end_date = db.normalize_date(start_date), db.normalize_date(end_date)
+    with db.transaction() as conn:
+        dates = [row[0] for row in conn.execute(
+            "SELECT DISTINCT date FROM appointments WHERE date BETWEEN ? AND ?", (start_date, end_date))]
+        # Only appointments from today on can still be cancelled with the customer
+        upcoming = conn.execute("SELECT id FROM appointments WHERE date BETWEEN ? AND ?",
+                                (max(start_date, datetime.now().strftime(db.DATE_FORMAT)), end_date)).fetchall()
+        for (id,) in upcoming:
+            notifications.queue_cancellation(conn, id)
+        cancelled = conn.execute("DELETE FROM appointments WHERE date BETWEEN ? AND ?", (start_date, end_date)).rowcount
+    availability.invalidate(*dates)
+    notifications.wake()
+    return {"cancelled": cancelled}
+
+
+@metrics.timed("db")
+def reschedule_appointments(ids, new_date):
+    """
+    Move appointments to new_date, keeping their time and barber.
+    Appointments whose barber is off or already busy at that time on new_date stay where they are.
+    Returns {"moved": n, "conflicts": [ids left in place]}.
+    """
+    new_date = db.normalize_date(new_date)
+    moved, conflicts, old_dates = 0, [], set()
+    with db.transaction() as conn:
+        for id in ids:
+            row = conn.execute("SELECT date, time, end_time, barber_id FROM appointments WHERE id = ?", (id,)).fetchone()
+            if not row:
+                continue
+            date, start, end, barber_id = row
+            if date != new_date and not _barber_is_free(conn, barber_id, new_date, start, end,
+                                                        include_holds=False, exclude_id=id):
+                conflicts.append(id)
+                continue
+            conn.execute("UPDATE appointments SET date = ? WHERE id = ?", (new_date, id))
+            if date != new_date:
+                notifications.queue_reschedule(conn, id)
+            old_dates.add(date)
+            moved += 1
+    availability.invalidate(new_date, *old_dates)
+    notifications.wake()
+    return {"moved": moved, "conflicts": conflicts}
+
+
+@metrics.timed("db")
+def import_appointments_csv(file):
+    """
+    Import bookings from a CSV file with name, contact, service, date and time columns,
+    plus an optional barber column (login or name). Services and barbers must exist
+    (matched ignoring case). Rows without a barber go to the first barber free for
+    the service's duration; rows nobody can take are skipped.
+    Returns {"imported": n, "taken": n, "invalid": [(line, reason)]}.
+    """
+    rows, invalid = [], []
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    missing = {"name", "contact", "service", "date", "time"} - set(reader.fieldnames or [])
+    if missing:
+        return {"imported": 0, "taken": 0, "invalid": [(1, f"Missing column(s): {', '.join(sorted(missing))}")]}
+    with db.connection() as conn:
+        barber_ids = {key.lower(): id for id, login, name in conn.execute("""
+            SELECT DISTINCT u.id, u.login, u.name FROM user_access_data u JOIN barber_hours h ON h.barber_id = u.id
+        """) for key in (login, name) if key}
+    services = {name.lower(): name for name in catalog.get_catalog()}
+    for line, record in enumerate(reader, start=2):
+        barber = (record.get("barber") or "").strip().lower()
+        if barber and barber not in barber_ids:
+            invalid.append((line, f"Unknown barber: {record['barber']!r}"))
+            continue
+        service = services.get((record["service"] or "").strip().lower())
+        if service is None:
+            invalid.append((line, f"Unknown service: {record['service']!r}"))
+            continue
+        try:
+            time = db.normalize_time(record["time"])
+            rows.append((record["name"], record["contact"], service, db.normalize_date(record["date"]),
+                         time, availability.end_time(time, _service_duration(service)), barber_ids.get(barber)))
+        except ValueError as e:
+            invalid.append((line, str(e)))
+
+    imported = 0
+    with db.transaction() as conn:
+        for name, contact, service, date, time, end, barber_id in rows:
+            chosen = _find_free_barber(conn, date, time, end, barber_id=barber_id, include_holds=False)
+            if chosen is None:
+                continue
+            appointment_id = conn.execute("""
+                INSERT INTO appointments (name, contact, service, date, time, barber_id, end_time, customer_id, price_cents)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (name, contact, service, date, time, chosen, end, upsert_customer(conn, name, contact),
+                  _service_price_cents(service))).lastrowid
+            notifications.queue_booking(conn, appointment_id)
+            imported += 1
+    availability.invalidate(*{row[3] for row in rows})
+    notifications.wake()
+    return {"imported": imported, "taken": len(rows) - imported, "invalid": invalid}
+
+
+@metrics.timed("db")
+def get_booked_times(date):
+    """Retrieve all booked times for a specific date."""
+    with db.connection() as conn:
+        rows = conn.execute("SELECT time FROM appointments WHERE date = ?", (db.normalize_date(date),)).fetchall()
+    return [row[0] for row in rows]
+
+
+@metrics.timed("db")
+def get_appointments():
+    with db.connection() as conn:
+        return conn.execute("SELECT * FROM appointments ORDER BY date, time").fetchall()
+
+
+def _appointment_filters(start_date=None, end_date=None, service=None, search=None):
+    """Build the WHERE clause shared by query_appointments and count_appointments."""
+    clauses, params = [], []
+    if start_date:
+        clauses.append("date >= ?")
+        params.append(db.normalize_date(start_date))
+    if end_date:
+        clauses.append("date <= ?")
+        params.append(db.normalize_date(end_date))
+    if service:
+        clauses.append("service = ?")
+        params.append(service)
+    if search:
+        clauses.append("(name LIKE ? ESCAPE '\\' OR contact LIKE ? ESCAPE '\\')")
+        pattern = "%" + re.sub(r"([\\%_])", r"\\\1", search.strip()) + "%"
+        params += [pattern, pattern]
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+@metrics.timed("db")
+def query_appointments(start_date=None, end_date=None, service=None, search=None, limit=50, offset=0):
+    """
+    Return one page of appointments matching the filters, ordered by date and time.
+    Filtering and paging run in SQLite, so the cost is bounded by the page size.
+    """
+    where, params = _appointment_filters(start_date, end_date, service, search)
+    with db.connection() as conn:
+        return conn.execute(f"SELECT * FROM appointments{where} ORDER BY date, time LIMIT ? OFFSET ?",
+                            params + [limit, offset]).fetchall()
+
+
+@metrics.timed("db")
+def count_appointments(start_date=None, end_date=None, service=None, search=None):
+    where, params = _appointment_filters(start_date, end_date, service, search)
+    with db.connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM appointments{where}", params).fetchone()[0]
@@ -0,0 +1,53 @@
+# data/customers.py
+import db
+import metrics
+
+
+# Customers are keyed by normalized contact, so a regular is one row however they typed it
+def upsert_customer(conn, name, contact):
+    """Return the id of the customer with this contact inside a transaction, creating or renaming them."""
+    if not contact:
+        return None
+    key = db.normalize_contact(contact)
+    conn.execute("""
+        INSERT INTO customers (contact_key, contact, name, name_key) VALUES (?, ?, ?, ?)
+        ON CONFLICT (contact_key) DO UPDATE SET name = excluded.name, name_key = excluded.name_key
+    """, (key, contact, name, (name or "").casefold()))
+    return conn.execute("SELECT id FROM customers WHERE contact_key = ?", (key,)).fetchone()[0]
+
+
+@metrics.timed("db")
+def search_customers(prefix, limit=20):
+    """
+    Return (id, name, contact, visits, last visit) for customers whose name or contact
+    starts with prefix. Both lookups are range scans on an index.
+    """
+    prefix = prefix.strip()
+    if not prefix:
+        return []
+    name_range = db.prefix_range(prefix.casefold())
+    contact_range = db.prefix_range(db.normalize_contact(prefix))
+    with db.connection() as conn:
+        return conn.execute("""
+            SELECT c.id, c.name, c.contact,
+                   (SELECT COUNT(*) FROM appointments a WHERE a.customer_id = c.id),
+                   (SELECT MAX(a.date) FROM appointments a WHERE a.customer_id = c.id)
+            FROM customers c
+            WHERE c.id IN (
+                SELECT id FROM customers WHERE name_key >= ? AND name_key < ?
+                UNION
+                SELECT id FROM customers WHERE contact_key >= ? AND contact_key < ?
+            )
+            ORDER BY c.name_key
+            LIMIT ?
+        """, (*name_range, *contact_range, limit)).fetchall()
+
+
+@metrics.timed("db")
+def get_customer_history(customer_id):
+    """Return (id, date, time, service, barber_id) for every appointment of a customer, newest first."""
+    with db.connection() as conn:
+        return conn.execute("""
+            SELECT id, date, time, service, barber_id FROM appointments
+            WHERE customer_id = ? ORDER BY date DESC, time DESC
+        """, (customer_id,)).fetchall()
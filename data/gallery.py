@@ -0,0 +1,28 @@
+# data/gallery.py
+import db
+import metrics
+
+
+@metrics.timed("db")
+def add_gallery_image(processed, caption):
+    """Record an image processed by images.save_upload(); re-uploading the same picture only updates its caption."""
+    with db.transaction() as conn:
+        conn.execute("""
+            INSERT INTO gallery (path, thumb_path, caption, width, height, hash) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (hash) DO UPDATE SET caption = excluded.caption
+        """, (processed.paths["display"], processed.paths["thumb"], caption,
+              processed.width, processed.height, processed.hash))
+
+
+@metrics.timed("db")
+def get_gallery_images(limit, offset=0):
+    """Return (id, path, thumb_path, caption) for one page of the gallery, newest first."""
+    with db.connection() as conn:
+        return conn.execute("SELECT id, path, thumb_path, caption FROM gallery ORDER BY id DESC LIMIT ? OFFSET ?",
+                            (limit, offset)).fetchall()
+
+
+@metrics.timed("db")
+def count_gallery_images():
+    with db.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM gallery").fetchone()[0]
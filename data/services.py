@@ -0,0 +1,37 @@
+# data/services.py
+import availability
+import catalog
+import db
+import metrics
+
+
+@metrics.timed("db")
+def update_services(price, image_path):
+    with db.transaction() as conn:
+        conn.execute("UPDATE services SET image_path = ? WHERE price = ?",
+                     (image_path, price))
+    catalog.invalidate()
+
+
+@metrics.timed("db")
+def add_service(name, description, price, image_path, duration=availability.DEFAULT_DURATION):
+    with db.transaction() as conn:
+        conn.execute("""
+            INSERT INTO services (name, description, price, image_path, duration_minutes, price_cents) VALUES (?, ?, ?, ?, ?, ?)
+        """, (name, description, price, image_path, duration, db.parse_price(price)))
+    catalog.invalidate()
+
+
+@metrics.timed("db")
+def get_services():
+    with db.connection() as conn:
+        return conn.execute("SELECT * FROM services").fetchall()
+
+
+def get_service_by_name():
+    return [(name,) for name in catalog.get_catalog()]
+
+
+def get_service_price(service_name):
+    service = catalog.get_service(service_name)
+    return (service.price,) if service else None
@@ -0,0 +1,23 @@
+# data/shop.py
+import db
+import metrics
+
+
+@metrics.timed("db")
+def insert_barber_shop_info(address, phone, cell, mail):
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO BARBER_SHOP_INFO (address, phone, cell, mail) VALUES (?, ?, ?, ?)",
+                     (address, phone, cell, mail))
+
+
+@metrics.timed("db")
+def update_barber_shop_info(address, phone, cell, mail):
+    with db.transaction() as conn:
+        conn.execute("UPDATE BARBER_SHOP_INFO SET address = ?, phone = ?, cell = ?, mail = ?",
+                     (address, phone, cell, mail))
+
+
+@metrics.timed("db")
+def get_barber_shop_info():
+    with db.connection() as conn:
+        return conn.execute("SELECT * FROM BARBER_SHOP_INFO").fetchall()
@@ -0,0 +1,147 @@
+# data/users.py
+from datetime import datetime
+import auth
+import availability
+import db
+import metrics
+import notifications
+from data.appointments import delete_appointments, upcoming_for_barber
+
+
+class StrandedAppointments(ValueError):
+    """A change to a barber would leave upcoming appointments they can no longer keep; ids lists them."""
+
+    def __init__(self, message, ids):
+        super().__init__(message)
+        self.ids = ids
+
+
+@metrics.timed("auth")  # Mostly scrypt, not SQLite
+def validate_login(cursor, username, password):
+    """
+    Validates the login credentials against the database.
+    Args:
+        cursor: SQLite cursor for database interaction.
+        username (str): The entered username.
+        password (str): The entered password.
+    Returns:
+        dict or None: Returns user details as a dictionary if valid, otherwise None.
+    """
+    cursor.execute("""
+        SELECT id, login, name, role, password FROM user_access_data
+        WHERE login = ?
+    """, (username,))
+    user = cursor.fetchone()
+
+    if not user:
+        auth.verify_dummy(password)  # Same cost as a real check, so unknown logins are not revealed by timing
+        return None
+    matches, needs_rehash = auth.verify_password(password, user[4])
+    if not matches:
+        return None
+    if needs_rehash:  # Transparently replace plaintext or outdated hashes on successful login
+        with db.transaction() as conn:
+            conn.execute("UPDATE user_access_data SET password = ? WHERE id = ?", (auth.hash_password(password), user[0]))
+    return {"id": user[0], "login": user[1], "name": user[2], "role": user[3]}
+
+
+@metrics.timed("db")
+def update_manager__credentials(username, password, name, cell, mail):    # Update manager credentials
+        with db.transaction() as conn:
+            conn.execute("UPDATE user_access_data SET password = ?, name = ?, cell = ?, mail = ? WHERE login = ?",
+                         (auth.hash_password(password), name, cell, mail, username))
+
+
+@metrics.timed("db")
+def insert_employee_access(ename, epass, ecell, email):
+    with db.transaction() as conn:
+        employee_id = conn.execute("INSERT INTO user_access_data (login, name, password, cell, mail) VALUES (?, ?, ?, ?, ?)",
+                                   (ename, ename.lower(), auth.hash_password(epass), ecell, email)).lastrowid
+        # New employees start as barbers working the default hours every day
+        conn.executemany("INSERT INTO barber_hours (barber_id, weekday, start_time, end_time) VALUES (?, ?, ?, ?)",
+                         [(employee_id, weekday, availability.DEFAULT_OPENING_TIME, availability.DEFAULT_CLOSING_TIME)
+                          for weekday in range(7)])
+    availability.invalidate_barbers()
+
+
+@metrics.timed("db")
+def update_employee_access(ename, epass, ecell, email, id):
+    with db.transaction() as conn:
+        conn.execute("UPDATE user_access_data SET name = ?, password = ?, cell = ?, mail = ? WHERE id = ?",
+                     (ename, auth.hash_password(epass), ecell, email, id))
+
+
+@metrics.timed("db")
+def remove_employees_data(id, cancel_upcoming=False):
+    """
+    Remove an employee and their working hours. Their upcoming appointments are
+    cancelled in the same transaction (customers are notified) when cancel_upcoming
+    is set; otherwise StrandedAppointments is raised and nothing changes.
+    Past appointments are kept for the reports.
+    """
+    with db.transaction() as conn:
+        upcoming = [row[0] for row in upcoming_for_barber(conn, id)]
+        if upcoming and not cancel_upcoming:
+            raise StrandedAppointments(f"{len(upcoming)} upcoming appointment(s) are booked with this barber", upcoming)
+        _, dates = delete_appointments(conn, upcoming)
+        conn.execute("DELETE FROM user_access_data WHERE id = ?", (id,))
+        conn.execute("DELETE FROM barber_hours WHERE barber_id = ?", (id,))
+    availability.invalidate(*dates)
+    availability.invalidate_barbers()
+    notifications.wake()
+
+
+@metrics.timed("db")
+def get_barber_hours(barber_id):
+    """Return {weekday: (start HH:MM, end HH:MM)} for the days barber_id works."""
+    with db.connection() as conn:
+        rows = conn.execute("SELECT weekday, start_time, end_time FROM barber_hours WHERE barber_id = ?",
+                            (barber_id,)).fetchall()
+    return {weekday: (start, end) for weekday, start, end in rows}
+
+
+@metrics.timed("db")
+def set_barber_hours(barber_id, hours, cancel_stranded=False):
+    """
+    Replace barber_id's working hours with hours, a {weekday: (start, end)} dict; missing days are off.
+    Upcoming appointments that no longer fit are cancelled (customers are notified) when
+    cancel_stranded is set; otherwise StrandedAppointments is raised and nothing changes.
+    """
+    rows = [(barber_id, weekday, db.normalize_time(start), db.normalize_time(end)) for weekday, (start, end) in hours.items()]
+    for _, weekday, start, end in rows:
+        if start >= end:
+            raise ValueError(f"{availability.WEEKDAYS[weekday]}: start must be before end")
+    new_hours = {weekday: (start, end) for _, weekday, start, end in rows}
+    with db.transaction() as conn:
+        stranded = []
+        for id, date, start, end in upcoming_for_barber(conn, barber_id):
+            day_hours = new_hours.get(datetime.fromisoformat(date).weekday())
+            if not day_hours or start < day_hours[0] or end > day_hours[1]:
+                stranded.append(id)
+        if stranded and not cancel_stranded:
+            raise StrandedAppointments(f"{len(stranded)} upcoming appointment(s) fall outside these hours", stranded)
+        _, dates = delete_appointments(conn, stranded)
+        conn.execute("DELETE FROM barber_hours WHERE barber_id = ?", (barber_id,))
+        conn.executemany("INSERT INTO barber_hours (barber_id, weekday, start_time, end_time) VALUES (?, ?, ?, ?)", rows)
+    availability.invalidate(*dates)
+    availability.invalidate_barbers()
+    notifications.wake()
+
+
+@metrics.timed("db")
+def get_employees():
+    with db.connection() as conn:
+        return conn.execute("SELECT id, login, name, cell, mail FROM user_access_data WHERE login != 'manager'").fetchall()
+
+
+@metrics.timed("db")
+def get_users():
+    """Return (id, display name) for every user, manager included."""
+    with db.connection() as conn:
+        return conn.execute("SELECT id, COALESCE(name, login) FROM user_access_data ORDER BY id").fetchall()
+
+
+@metrics.timed("db")
+def get_user_profile(user_id):
+    with db.connection() as conn:
+        return conn.execute("SELECT name, cell, mail FROM user_access_data WHERE id = ?", (user_id,)).fetchone()
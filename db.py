@@ -0,0 +1,213 @@
+# db.py
+import datetime
+import os
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+import metrics
+
+
+DB_PATH = os.environ.get("BARBER_SHOP_DB", "barber_shop.db")
+POOL_SIZE = int(os.environ.get("BARBER_SHOP_DB_POOL_SIZE", "8"))
+BUSY_TIMEOUT = 5.0  # seconds a connection waits on a locked database
+
+# Applied once to every new connection. WAL lets readers run alongside the
+# single writer, and synchronous=NORMAL is durable enough in WAL mode while
+# skipping an fsync per commit.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -8000",  # ~8 MB page cache per connection
+    "PRAGMA mmap_size = 67108864",  # 64 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}",
+)
+
+
+class ConnectionPool:
+    """
+    A small pool of SQLite connections shared by every session of the server process.
+    Connections are created lazily, configured once and reused, so a page render
+    no longer pays a connect/teardown for every query.
+    """
+
+    def __init__(self, path=DB_PATH, size=POOL_SIZE, timeout=BUSY_TIMEOUT):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Autocommit mode: transactions are opened explicitly by transaction().
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False, isolation_level=None)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        if metrics.ENABLED:
+            conn.set_trace_callback(metrics.count_statement)
+        metrics.connection_opened()
+        with self._lock:
+            self._all.append(conn)
+        return conn
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No database connection available after {self.timeout}s")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        if conn.in_transaction:  # Never hand a half-finished transaction to the next caller
+            conn.rollback()
+        self._idle.put(conn)
+        self._slots.release()
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+        self._idle = queue.LifoQueue()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection for reads; it is returned to the pool on exit."""
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def transaction():
+    """
+    Borrow a pooled connection inside a write transaction.
+    Commits on success and rolls back if the block raises. BEGIN IMMEDIATE takes
+    the write lock up front so concurrent writers queue on busy_timeout instead
+    of failing halfway through.
+    """
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+# Storage formats. Dates and times are kept as zero-padded ISO text so that
+# string order is chronological order and the (date, time) index can serve
+# range scans and ORDER BY directly.
+DATE_FORMAT = "%Y-%m-%d"
+TIME_FORMAT = "%H:%M"
+_DATE_INPUT_FORMATS = (DATE_FORMAT, "%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y", "%d.%m.%Y")
+_TIME_INPUT_FORMATS = (TIME_FORMAT, "%H:%M:%S", "%I:%M %p", "%H%M")
+
+
+def normalize_date(value):
+    """Return value (a date, datetime or common date string) as YYYY-MM-DD."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime(DATE_FORMAT)
+    text = str(value).strip()
+    if len(text) == 10:  # Fast path for values already stored as YYYY-MM-DD
+        try:
+            return datetime.date.fromisoformat(text).isoformat()
+        except ValueError:
+            pass
+    for fmt in _DATE_INPUT_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, fmt).strftime(DATE_FORMAT)
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognised date: {value!r}")
+
+
+def normalize_time(value):
+    """Return value (a time, datetime or common time string) as HH:MM."""
+    if isinstance(value, (datetime.time, datetime.datetime)):
+        return value.strftime(TIME_FORMAT)
+    text = str(value).strip().upper()
+    for fmt in _TIME_INPUT_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, fmt).strftime(TIME_FORMAT)
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognised time: {value!r}")
+
+
+def normalize_contact(contact):
+    """Return the key a customer is identified by: a lowercased email, or a phone number's digits."""
+    text = str(contact).strip()
+    if "@" in text:
+        return text.lower()
+    digits = "".join(ch for ch in text if ch.isdigit())
+    return digits or text.lower()
+
+
+def prefix_range(prefix):
+    """(low, high) bounds matching every string that starts with prefix, for index range scans."""
+    return prefix, prefix + "\uffff"
+
+
+_PRICE_NUMBER = re.compile(r"\d[\d.,]*")
+
+
+def parse_price(value):
+    """
+    Return a price such as "$20", "20.50" or "R$ 25,00" as integer cents, or None
+    if it contains no number. The last "." or "," followed by one or two digits
+    is taken as the decimal separator; any other separators group thousands.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return round(value * 100)
+    match = _PRICE_NUMBER.search(str(value))
+    if not match:
+        return None
+    number = match.group().rstrip(".,")
+    whole, cents = number, "0"
+    for sep in (".", ","):
+        head, found, tail = number.rpartition(sep)
+        if found and 1 <= len(tail) <= 2 and tail.isdigit():
+            whole, cents = head, tail.ljust(2, "0")
+            break
+    whole = "".join(ch for ch in whole if ch.isdigit()) or "0"
+    return int(whole) * 100 + int(cents)
@@ -0,0 +1,156 @@
+# export.py
+import argparse
+import csv
+import io
+import sys
+import tempfile
+import db
+
+
+# Rows are read from SQLite in batches of EXPORT_BATCH_SIZE and written out
+# before the next batch is fetched, so memory use does not grow with the table.
+EXPORT_BATCH_SIZE = 1000
+SPOOL_LIMIT = 8 * 1024 * 1024  # bytes an export keeps in memory before spilling to a temp file
+
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+# (column, Arrow type) for each export
+APPOINTMENT_COLUMNS = (
+    ("id", "int64"), ("date", "string"), ("time", "string"), ("end_time", "string"), ("barber", "string"),
+    ("name", "string"), ("contact", "string"), ("service", "string"), ("price", "float64"),
+)
+DAILY_STATS_COLUMNS = (
+    ("date", "string"), ("barber", "string"), ("service", "string"), ("bookings", "int64"),
+    ("revenue", "float64"), ("booked_minutes", "int64"),
+)
+
+
+def _range_filter(column, start, end):
+    where, params = [], []
+    if start:
+        where.append(f"{column} >= ?")
+        params.append(db.normalize_date(start))
+    if end:
+        where.append(f"{column} <= ?")
+        params.append(db.normalize_date(end))
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def _iter_batches(query, params, batch_size):
+    # The pooled connection is held until the generator is exhausted or closed
+    with db.connection() as conn:
+        cursor = conn.execute(query, params)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            yield batch
+
+
+def iter_appointments(start=None, end=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield lists of appointment rows (see APPOINTMENT_COLUMNS) from start to end inclusive, in date order."""
+    where, params = _range_filter("a.date", start, end)
+    return _iter_batches(f"""
+        SELECT a.id, a.date, a.time, a.end_time, COALESCE(u.name, u.login), a.name, a.contact, a.service,
+               a.price_cents / 100.0
+        FROM appointments a LEFT JOIN user_access_data u ON u.id = a.barber_id{where}
+        ORDER BY a.date, a.time, a.barber_id
+    """, params, batch_size)
+
+
+def iter_daily_stats(start=None, end=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield lists of daily aggregate rows (see DAILY_STATS_COLUMNS) from start to end inclusive."""
+    where, params = _range_filter("s.date", start, end)
+    return _iter_batches(f"""
+        SELECT s.date, COALESCE(u.name, u.login), s.service, s.bookings, s.revenue_cents / 100.0, s.booked_minutes
+        FROM daily_stats s LEFT JOIN user_access_data u ON u.id = s.barber_id{where}
+        ORDER BY s.date, s.barber_id, s.service
+    """, params, batch_size)
+
+
+EXPORTS = {
+    "appointments": (APPOINTMENT_COLUMNS, iter_appointments),
+    "daily-stats": (DAILY_STATS_COLUMNS, iter_daily_stats),
+}
+
+
+def write_csv(columns, batches, out):
+    """Write a header and every batch to the text stream out. Returns the number of rows written."""
+    writer = csv.writer(out)
+    writer.writerow([name for name, _ in columns])
+    rows = 0
+    for batch in batches:
+        writer.writerows(batch)
+        rows += len(batch)
+    return rows
+
+
+def write_parquet(columns, batches, out):
+    """Write every batch as a Parquet row group to the binary stream or path out. Returns the number of rows written."""
+    import pyarrow as pa  # Installed with Streamlit; only needed for this format
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in columns])
+    rows = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for batch in batches:
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+        if not rows:
+            writer.write_table(schema.empty_table())
+    return rows
+
+
+def export(kind, fmt, out, start=None, end=None):
+    """
+    Stream the kind export ("appointments" or "daily-stats") from start to end
+    inclusive to out, a binary stream or path, as fmt ("csv" or "parquet").
+    Returns the number of rows written.
+    """
+    columns, iter_rows = EXPORTS[kind]
+    batches = iter_rows(start, end)
+    if fmt == "parquet":
+        return write_parquet(columns, batches, out)
+    if isinstance(out, str):
+        with open(out, "w", encoding="utf-8", newline="") as f:
+            return write_csv(columns, batches, f)
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    try:
+        return write_csv(columns, batches, text)
+    finally:
+        text.detach()  # Leave out open for the caller
+
+
+def export_bytes(kind, fmt, start=None, end=None):
+    """
+    Return the export as bytes, for st.download_button (which only accepts
+    str, bytes or plain file objects). Rows are streamed into a temporary
+    file, kept in memory up to SPOOL_LIMIT bytes, and read back once at the end.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT) as out:
+        export(kind, fmt, out, start, end)
+        out.seek(0)
+        return out.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export appointments or daily report aggregates.")
+    parser.add_argument("kind", choices=EXPORTS)
+    parser.add_argument("--from", dest="start", help="first date to include (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="last date to include (YYYY-MM-DD)")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("-o", "--output", help="file to write; CSV goes to standard output if omitted")
+    args = parser.parse_args(argv)
+    if args.format == "parquet" and not args.output:
+        parser.error("--output is required for parquet")
+
+    import migrations
+    migrations.migrate()
+    rows = export(args.kind, args.format, args.output or sys.stdout.buffer, args.start, args.end)
+    sys.stdout.flush()
+    print(f"Exported {rows} row(s).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# images.py
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from PIL import Image, ImageOps
+import metrics
+
+
+# Longest edge, in pixels, of each variant generated at upload time
+VARIANTS = {"thumb": 320, "display": 1280}
+JPEG_QUALITY = 85
+BYTE_CACHE_LIMIT = 64 * 1024 * 1024  # total bytes kept in memory
+
+# st.image only sends JPEG or PNG to the browser and transcodes anything else on
+# every rerun, so variants are stored in the format it would pick: JPEG for opaque
+# images, PNG for images with transparency. Pass output_format(path) to st.image
+# and it sends the file's bytes unchanged.
+_SAVE_OPTIONS = {
+    ".jpg": ("JPEG", {"quality": JPEG_QUALITY, "optimize": True, "progressive": True}),
+    ".png": ("PNG", {"optimize": True}),
+}
+
+ProcessedImage = namedtuple("ProcessedImage", ["hash", "width", "height", "paths"])
+
+# Files written by save_upload are named <content hash>_<variant>.<jpg|png> and never
+# change afterwards, which makes them safe to cache without checking mtimes.
+# (.webp variants were written before migration 12 re-encoded them.)
+_VARIANT_NAME = re.compile(r"^(?P<hash>[0-9a-f]{16})_(?P<variant>[a-z]+)(?P<ext>\.jpg|\.png|\.webp)$")
+
+
+@metrics.timed("images")
+def save_upload(data, folder):
+    """
+    Resize and recompress uploaded image bytes into the JPEG (or, with transparency, PNG) variants in VARIANTS.
+    Files are named by content hash, so uploading the same picture twice reuses
+    the existing files.
+    Args:
+        data (bytes): The raw uploaded file.
+        folder (str): Directory the variants are written to.
+    Returns:
+        ProcessedImage: Content hash, original dimensions and {variant: path}.
+    Raises:
+        ValueError: If data is not an image Pillow can read (corrupt, truncated or renamed).
+    """
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    os.makedirs(folder, exist_ok=True)
+
+    try:
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+        image.load()  # Decode now, so a truncated file fails here rather than halfway through the variants
+    except (OSError, Image.DecompressionBombError) as e:  # UnidentifiedImageError is an OSError
+        raise ValueError(f"Not a readable image: {e}") from e
+    image = _browser_mode(image)
+    ext = ".png" if image.mode == "RGBA" else ".jpg"
+
+    paths = {}
+    for variant, size in VARIANTS.items():
+        path = os.path.join(folder, f"{digest}_{variant}{ext}")
+        if not os.path.exists(path):
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.LANCZOS)
+            _write(resized, path)
+        paths[variant] = path
+    return ProcessedImage(digest, image.width, image.height, paths)
+
+
+def _browser_mode(image):
+    # RGB, or RGBA only when some pixel is actually transparent
+    if "A" in image.getbands() or "transparency" in image.info:
+        image = image.convert("RGBA")
+        if image.getextrema()[3][0] < 255:
+            return image
+    return image if image.mode == "RGB" else image.convert("RGB")
+
+
+def _write(image, path):
+    format, options = _SAVE_OPTIONS[os.path.splitext(path)[1]]
+    tmp_path = f"{path}.tmp"
+    image.save(tmp_path, format, **options)
+    os.replace(tmp_path, path)  # Readers never see a half-written file
+
+
+def reencode_webp_variants(path):
+    """
+    Rewrite every WebP variant of the processed image at path as JPEG or PNG, next to
+    the originals. Returns the new path of path's own variant, or None if it is missing.
+    """
+    match = _VARIANT_NAME.match(os.path.basename(path))
+    if not match or match["ext"] != ".webp" or not os.path.isfile(path):
+        return None
+    with Image.open(path) as image:
+        ext = ".png" if _browser_mode(image).mode == "RGBA" else ".jpg"
+    folder = os.path.dirname(path)
+    for variant in VARIANTS:
+        old = os.path.join(folder, f"{match['hash']}_{variant}.webp")
+        new = os.path.join(folder, f"{match['hash']}_{variant}{ext}")
+        if os.path.isfile(old) and not os.path.exists(new):
+            with Image.open(old) as image:
+                _write(image.convert("RGBA" if ext == ".png" else "RGB"), new)
+    return os.path.join(folder, f"{match['hash']}_{match['variant']}{ext}")
+
+
+def output_format(path):
+    """The st.image output_format that sends the file at path without re-encoding it."""
+    return "PNG" if path.lower().endswith(".png") else "JPEG"
+
+
+def is_variant(path):
+    """True for files written by save_upload."""
+    return _VARIANT_NAME.match(os.path.basename(path)) is not None
+
+
+def variant_path(path, variant):
+    """Return the path of another variant of a processed image; other files are returned unchanged."""
+    folder, name = os.path.split(path)
+    match = _VARIANT_NAME.match(name)
+    if not match:
+        return path
+    return os.path.join(folder, f"{match['hash']}_{variant}{match['ext']}")
+
+
+class ByteCache:
+    """LRU cache of file contents bounded by total size rather than entry count."""
+
+    def __init__(self, limit=BYTE_CACHE_LIMIT):
+        self.limit = limit
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.limit:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.limit:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_cache = ByteCache()
+
+
+@metrics.timed("images")
+def read_bytes(path):
+    """Return the contents of an image file, served from memory after the first read."""
+    if _VARIANT_NAME.match(os.path.basename(path)):
+        key = path
+    else:  # Files not named by hash may be replaced in place
+        key = (path, os.stat(path).st_mtime_ns)
+    data = _cache.get(key)
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+        _cache.put(key, data)
+    return data
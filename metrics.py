@@ -0,0 +1,211 @@
+# metrics.py
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# In-process instrumentation. Decorated page functions and data-access helpers
+# feed latency histograms; SQLite statements are counted through each pooled
+# connection's trace callback. Streamlit runs every rerun in one script thread,
+# so per-rerun totals are kept in a thread-local.
+
+ENABLED = os.environ.get("BARBER_SHOP_METRICS", "1") != "0"
+# Set to a file path to append one JSON line per rerun
+LOG_PATH = os.environ.get("BARBER_SHOP_METRICS_LOG")
+
+LATENCY_BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+COUNT_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+RECENT_RERUNS = 50
+
+logger = logging.getLogger("barber_shop.metrics")
+if LOG_PATH:
+    _handler = logging.FileHandler(LOG_PATH)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket i counts values <= bounds[i], the last one everything larger."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (capped at the largest value seen)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds + (self.max,), self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": dict(zip([f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"], self.buckets)),
+        }
+
+
+class Registry:
+    """Process-wide histograms and counters, shared by every session."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._histograms = {}
+        self._counters = {}
+        self._recent = deque(maxlen=RECENT_RERUNS)
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, bounds=LATENCY_BOUNDS_MS):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(bounds)
+            histogram.observe(value)
+
+    def increment(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def add_rerun(self, record):
+        with self._lock:
+            self._recent.append(record)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "since": self.started_at,
+                "counters": dict(self._counters),
+                "histograms": {name: h.to_dict() for name, h in sorted(self._histograms.items())},
+                "recent_reruns": list(self._recent),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._histograms.clear()
+            self._counters.clear()
+            self._recent.clear()
+
+
+registry = Registry()
+_local = threading.local()
+
+
+def _current():
+    # Totals of the rerun running in this thread, or None outside rerun()
+    return getattr(_local, "rerun", None)
+
+
+def count_statement(statement):
+    """SQLite trace callback: count each statement run on a pooled connection, including those run by triggers."""
+    registry.increment("db.statements")
+    rerun = _current()
+    if rerun is not None:
+        rerun["statements"] += 1
+
+
+def timed(group):
+    """
+    Decorator recording each call's latency in the "<group>.<function name>"
+    histogram. Time spent in the outermost call of each group is also added to
+    the current rerun's per-group total, so nested helpers are not counted twice.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        name = f"{group}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            rerun = _current()
+            outermost = rerun is not None and group not in rerun["active"]
+            if outermost:
+                rerun["active"].add(group)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                registry.observe(name, elapsed_ms)
+                if outermost:
+                    rerun["active"].discard(group)
+                    rerun["groups"][group] = rerun["groups"].get(group, 0.0) + elapsed_ms
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def rerun():
+    """
+    Measure one script run: total time, SQLite statements and time per timed()
+    group, filed under the page passed to set_page(). Recorded even when the run
+    ends with st.rerun() or st.stop().
+    """
+    if not ENABLED:
+        yield
+        return
+    totals = _local.rerun = {"page": None, "statements": 0, "groups": {}, "active": set()}
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.rerun = None
+        page = totals["page"] or "unknown"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        registry.increment("reruns")
+        registry.observe(f"rerun.{page}", elapsed_ms)
+        registry.observe("statements_per_rerun", totals["statements"], COUNT_BOUNDS)
+        record = {"at": time.time(), "page": page, "ms": round(elapsed_ms, 2), "statements": totals["statements"],
+                  "groups_ms": {group: round(ms, 2) for group, ms in totals["groups"].items()}}
+        registry.add_rerun(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"event": "rerun", **record}))
+
+
+def set_page(page):
+    rerun = _current()
+    if rerun is not None:
+        rerun["page"] = page
+
+
+def increment(name, n=1):
+    if n:
+        registry.increment(name, n)
+
+
+def connection_opened():
+    registry.increment("db.connections_opened")
+
+
+def snapshot():
+    """Return every counter, histogram and recent rerun as a JSON-serialisable dict."""
+    return registry.snapshot()
+
+
+def reset():
+    registry.reset()
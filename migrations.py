@@ -0,0 +1,447 @@
+# migrations.py
+import os
+import threading
+import auth
+import db
+import images
+
+
+# Schema migrations, applied in order. Each step receives a connection inside
+# an open transaction and is recorded in schema_version once it succeeds, so
+# new indexes or columns only need a new entry appended to MIGRATIONS.
+
+def _initial_schema(conn):
+    # Create Appointments Table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS appointments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            contact TEXT,
+            service TEXT,
+            date TEXT,
+            time TEXT
+        )
+    """)
+
+    # Create Services Table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS services (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            description TEXT,
+            price TEXT,
+            image_path TEXT
+        )
+    """)
+    # create barber shop info table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS BARBER_SHOP_INFO (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            address TEXT,
+            phone TEXT,
+            cell TEXT,
+            mail TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_access_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            role TEXT DEFAULT 'employee',
+            login TEXT UNIQUE,  -- Ensure login is unique
+            name TEXT,
+            password TEXT,
+            cell TEXT,
+            mail TEXT
+        )
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO user_access_data (id, role, login, password)
+        VALUES (?, 'manager', ?, ?)
+    """, (1, "manager", "password123"))
+
+
+def _index_appointments(conn):
+    """
+    Rebuild appointments with normalized YYYY-MM-DD / HH:MM values and a unique
+    (date, time) index. Rows that cannot be parsed, or that double-book a slot
+    already taken by an earlier appointment, are moved to appointments_rejected
+    instead of being dropped.
+    """
+    conn.execute("""
+        CREATE TABLE appointments_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            contact TEXT,
+            service TEXT,
+            date TEXT NOT NULL CHECK (date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'),
+            time TEXT NOT NULL CHECK (time GLOB '[0-9][0-9]:[0-9][0-9]')
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS appointments_rejected (
+            id INTEGER PRIMARY KEY,
+            name TEXT,
+            contact TEXT,
+            service TEXT,
+            date TEXT,
+            time TEXT,
+            reason TEXT
+        )
+    """)
+
+    kept, rejected, taken = [], [], set()
+    for row in conn.execute("SELECT id, name, contact, service, date, time FROM appointments ORDER BY id"):
+        try:
+            slot = (db.normalize_date(row[4]), db.normalize_time(row[5]))
+        except ValueError as e:
+            rejected.append(row + (str(e),))
+            continue
+        if slot in taken:
+            rejected.append(row + ("Slot already booked",))
+            continue
+        taken.add(slot)
+        kept.append(row[:4] + slot)
+
+    conn.executemany("INSERT INTO appointments_new (id, name, contact, service, date, time) VALUES (?, ?, ?, ?, ?, ?)", kept)
+    conn.executemany("INSERT INTO appointments_rejected (id, name, contact, service, date, time, reason) VALUES (?, ?, ?, ?, ?, ?, ?)", rejected)
+
+    # Keep the AUTOINCREMENT high-water mark so ids of deleted rows are never reused.
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'appointments'").fetchone()
+    conn.execute("DROP TABLE appointments")
+    conn.execute("ALTER TABLE appointments_new RENAME TO appointments")
+    if seq:
+        conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'appointments'", (seq[0],))
+
+    conn.execute("CREATE UNIQUE INDEX idx_appointments_slot ON appointments (date, time)")
+
+
+def _gallery_table(conn):
+    """Create the gallery metadata table and index any images already in uploads/gallery."""
+    conn.execute("""
+        CREATE TABLE gallery (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL,
+            thumb_path TEXT NOT NULL,
+            caption TEXT,
+            width INTEGER,
+            height INTEGER,
+            hash TEXT UNIQUE,
+            uploaded_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    folder = "uploads/gallery"
+    if not os.path.isdir(folder):
+        return
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if name.endswith(".tmp") or images.is_variant(path) or not os.path.isfile(path):
+            continue
+        processed = _resize_legacy_image(path)
+        if processed is None:  # Not an image
+            continue
+        conn.execute("""
+            INSERT OR IGNORE INTO gallery (path, thumb_path, caption, width, height, hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (processed.paths["display"], processed.paths["thumb"], name, processed.width, processed.height,
+              processed.hash))
+
+
+def _resize_legacy_image(path):
+    # Write the upload-time variants next to an image saved before uploads were resized
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return images.save_upload(data, os.path.dirname(path))
+    except ValueError:
+        return None
+
+
+def _index_appointments_by_service(conn):
+    # Serves the service filter on the Manage Appointments page
+    conn.execute("CREATE INDEX idx_appointments_service ON appointments (service, date, time)")
+
+
+def _slot_holds(conn):
+    # Short-lived holds on a slot while a customer completes the booking form
+    conn.execute("""
+        CREATE TABLE slot_holds (
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            token TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (date, time)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_slot_holds_token ON slot_holds (token)")
+
+
+def _barber_scheduling(conn):
+    """
+    Assign appointments to barbers with an end time, give services a duration and
+    barbers working hours. Existing users get the old 09:00-18:00 every day, and
+    existing appointments are assigned to the manager for one 30-minute slot.
+    """
+    conn.execute("ALTER TABLE appointments ADD COLUMN barber_id INTEGER")
+    conn.execute("ALTER TABLE appointments ADD COLUMN end_time TEXT")
+    conn.execute("""
+        UPDATE appointments SET barber_id = 1,
+            end_time = CASE WHEN time >= '23:30' THEN '23:59' ELSE strftime('%H:%M', time, '+30 minutes') END
+    """)
+    conn.execute("DROP INDEX idx_appointments_slot")
+    conn.execute("CREATE UNIQUE INDEX idx_appointments_slot ON appointments (date, barber_id, time)")
+
+    conn.execute("ALTER TABLE services ADD COLUMN duration_minutes INTEGER NOT NULL DEFAULT 30")
+
+    conn.execute("""
+        CREATE TABLE barber_hours (
+            barber_id INTEGER NOT NULL,
+            weekday INTEGER NOT NULL CHECK (weekday BETWEEN 0 AND 6),  -- 0 = Monday
+            start_time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            PRIMARY KEY (barber_id, weekday)
+        ) WITHOUT ROWID
+    """)
+    conn.executemany("""
+        INSERT INTO barber_hours (barber_id, weekday, start_time, end_time)
+        SELECT id, ?, '09:00', '18:00' FROM user_access_data
+    """, [(weekday,) for weekday in range(7)])
+
+    # Holds now reserve an interval with a particular barber
+    conn.execute("DROP TABLE slot_holds")
+    conn.execute("""
+        CREATE TABLE slot_holds (
+            barber_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            token TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (date, barber_id, time)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_slot_holds_token ON slot_holds (token)")
+
+
+def _hash_passwords(conn):
+    # Replace plaintext passwords (including the seeded manager password) with scrypt hashes
+    rows = conn.execute("SELECT id, password FROM user_access_data WHERE password IS NOT NULL").fetchall()
+    conn.executemany("UPDATE user_access_data SET password = ? WHERE id = ?",
+                     [(auth.hash_password(password), id) for id, password in rows if not auth.is_hashed(password)])
+
+
+def _customers(conn):
+    """
+    Add a customers table keyed by normalized contact, link appointments to it and
+    backfill both from existing appointments; a customer's name is their latest one.
+    """
+    conn.execute("""
+        CREATE TABLE customers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            contact_key TEXT NOT NULL UNIQUE,
+            contact TEXT,
+            name TEXT,
+            name_key TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX idx_customers_name ON customers (name_key)")
+    conn.execute("ALTER TABLE appointments ADD COLUMN customer_id INTEGER REFERENCES customers (id)")
+    conn.execute("CREATE INDEX idx_appointments_customer ON appointments (customer_id, date, time)")
+
+    customers = {}
+    for id, name, contact in conn.execute("SELECT id, name, contact FROM appointments ORDER BY date, time"):
+        if not contact:
+            continue
+        key = db.normalize_contact(contact)
+        customer = customers.setdefault(key, {"contact": contact, "ids": []})
+        customer["name"] = name
+        customer["ids"].append(id)
+    for key, customer in customers.items():
+        customer_id = conn.execute("""
+            INSERT INTO customers (contact_key, contact, name, name_key) VALUES (?, ?, ?, ?)
+        """, (key, customer["contact"], customer["name"], (customer["name"] or "").casefold())).lastrowid
+        conn.executemany("UPDATE appointments SET customer_id = ? WHERE id = ?",
+                         [(customer_id, id) for id in customer["ids"]])
+
+
+# Keep daily_stats in step with appointments inside the writer's own transaction
+_STATS_ADD = """
+    INSERT INTO daily_stats (date, barber_id, service, bookings, revenue_cents, booked_minutes)
+    VALUES (NEW.date, COALESCE(NEW.barber_id, 0), COALESCE(NEW.service, ''), 1, COALESCE(NEW.price_cents, 0),
+            (strftime('%s', NEW.end_time) - strftime('%s', NEW.time)) / 60)
+    ON CONFLICT (date, barber_id, service) DO UPDATE SET
+        bookings = bookings + excluded.bookings,
+        revenue_cents = revenue_cents + excluded.revenue_cents,
+        booked_minutes = booked_minutes + excluded.booked_minutes;
+"""
+_STATS_REMOVE = """
+    UPDATE daily_stats SET
+        bookings = bookings - 1,
+        revenue_cents = revenue_cents - COALESCE(OLD.price_cents, 0),
+        booked_minutes = booked_minutes - (strftime('%s', OLD.end_time) - strftime('%s', OLD.time)) / 60
+    WHERE date = OLD.date AND barber_id = COALESCE(OLD.barber_id, 0) AND service = COALESCE(OLD.service, '');
+    DELETE FROM daily_stats
+    WHERE date = OLD.date AND barber_id = COALESCE(OLD.barber_id, 0) AND service = COALESCE(OLD.service, '')
+        AND bookings <= 0;
+"""
+
+
+def _daily_stats(conn):
+    """
+    Store prices as integer cents and add daily_stats, one row per date, barber and
+    service with its bookings, revenue and booked minutes. Triggers on appointments
+    keep it current, so reports read a few rows per day instead of every appointment.
+    Each appointment keeps the price it was booked at.
+    """
+    conn.execute("ALTER TABLE services ADD COLUMN price_cents INTEGER")
+    conn.executemany("UPDATE services SET price_cents = ? WHERE id = ?",
+                     [(db.parse_price(price), id) for id, price in conn.execute("SELECT id, price FROM services")])
+    conn.execute("ALTER TABLE appointments ADD COLUMN price_cents INTEGER")
+    conn.execute("""
+        UPDATE appointments SET price_cents = (
+            SELECT price_cents FROM services WHERE services.name = appointments.service ORDER BY id DESC LIMIT 1
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE daily_stats (
+            date TEXT NOT NULL,
+            barber_id INTEGER NOT NULL,
+            service TEXT NOT NULL,
+            bookings INTEGER NOT NULL DEFAULT 0,
+            revenue_cents INTEGER NOT NULL DEFAULT 0,
+            booked_minutes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (date, barber_id, service)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        INSERT INTO daily_stats (date, barber_id, service, bookings, revenue_cents, booked_minutes)
+        SELECT date, COALESCE(barber_id, 0), COALESCE(service, ''), COUNT(*), SUM(COALESCE(price_cents, 0)),
+               SUM((strftime('%s', end_time) - strftime('%s', time)) / 60)
+        FROM appointments GROUP BY 1, 2, 3
+    """)
+    conn.execute(f"CREATE TRIGGER appointments_stats_insert AFTER INSERT ON appointments BEGIN {_STATS_ADD} END")
+    conn.execute(f"CREATE TRIGGER appointments_stats_delete AFTER DELETE ON appointments BEGIN {_STATS_REMOVE} END")
+    conn.execute(f"""
+        CREATE TRIGGER appointments_stats_update
+        AFTER UPDATE OF date, time, end_time, barber_id, service, price_cents ON appointments
+        BEGIN {_STATS_REMOVE} {_STATS_ADD} END
+    """)
+
+
+def _outbox(conn):
+    """
+    Add the notification outbox. Rows are written in the same transaction as the
+    booking change they describe and sent later by the notifications worker.
+    """
+    conn.execute("""
+        CREATE TABLE outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,  -- confirmation, reminder, reschedule or cancellation
+            appointment_id INTEGER,
+            recipient TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending'
+                CHECK (status IN ('pending', 'sending', 'sent', 'failed', 'cancelled')),
+            send_after REAL NOT NULL,  -- Unix time; reminders are queued ahead of time
+            attempts INTEGER NOT NULL DEFAULT 0,
+            locked_until REAL,  -- Lease held by the worker sending the row
+            last_error TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            sent_at REAL
+        )
+    """)
+    conn.execute("CREATE INDEX idx_outbox_due ON outbox (status, send_after)")
+    conn.execute("CREATE INDEX idx_outbox_appointment ON outbox (appointment_id)")
+
+
+def _gallery_variants(conn):
+    """
+    Resize gallery images that migration 3 indexed as-is (thumb_path = path), so
+    the grid stops sending full-size legacy photos. The originals stay on disk.
+    """
+    for id, path in conn.execute("SELECT id, path FROM gallery WHERE thumb_path = path").fetchall():
+        processed = _resize_legacy_image(path) if os.path.isfile(path) else None
+        if processed is not None:
+            conn.execute("UPDATE gallery SET path = ?, thumb_path = ? WHERE id = ?",
+                         (processed.paths["display"], processed.paths["thumb"], id))
+
+
+def _browser_image_formats(conn):
+    """
+    Re-encode the WebP variants written by earlier uploads as JPEG or PNG, which
+    st.image sends as they are instead of transcoding them on every rerun.
+    """
+    converted = {}
+    for table, column in (("gallery", "path"), ("gallery", "thumb_path"), ("services", "image_path")):
+        for (path,) in conn.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} LIKE '%.webp'").fetchall():
+            if path not in converted:
+                converted[path] = images.reencode_webp_variants(path)
+            if converted[path]:
+                conn.execute(f"UPDATE {table} SET {column} = ? WHERE {column} = ?", (converted[path], path))
+
+
+def _service_variants(conn):
+    """
+    Resize service images saved before uploads were resized (image_path is not a
+    variant), so the Services page stops sending them full size. The originals stay on disk.
+    """
+    for id, path in conn.execute("SELECT id, image_path FROM services WHERE image_path IS NOT NULL").fetchall():
+        if images.is_variant(path) or not os.path.isfile(path):
+            continue
+        processed = _resize_legacy_image(path)
+        if processed is not None:
+            conn.execute("UPDATE services SET image_path = ? WHERE id = ?", (processed.paths["display"], id))
+
+
+MIGRATIONS = [
+    (1, _initial_schema),
+    (2, _index_appointments),
+    (3, _gallery_table),
+    (4, _index_appointments_by_service),
+    (5, _slot_holds),
+    (6, _barber_scheduling),
+    (7, _hash_passwords),
+    (8, _customers),
+    (9, _daily_stats),
+    (10, _outbox),
+    (11, _gallery_variants),
+    (12, _browser_image_formats),
+    (13, _service_variants),
+]
+
+_applied = False
+_lock = threading.Lock()
+
+
+def current_version(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate():
+    """
+    Bring the database schema up to date.
+    Only the first call in a process touches the database (see main.py).
+    """
+    global _applied
+    if _applied:
+        return
+    with _lock:
+        if _applied:
+            return
+        for version, step in MIGRATIONS:
+            # One transaction per step. The version is re-read under the write lock
+            # so two server processes starting together never apply a step twice.
+            with db.transaction() as conn:
+                if current_version(conn) >= version:
+                    continue
+                step(conn)
+                conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+        _applied = True
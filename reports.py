@@ -0,0 +1,78 @@
+# reports.py
+from datetime import date, timedelta
+import availability
+import db
+import metrics
+
+
+# Every report reads the daily_stats aggregate (one row per date, barber and
+# service), which triggers on appointments keep current; nothing here scans
+# the appointments table.
+
+def format_cents(cents):
+    return f"${(cents or 0) / 100:,.2f}"
+
+
+def _dates(start, end):
+    start = date.fromisoformat(db.normalize_date(start))
+    end = date.fromisoformat(db.normalize_date(end))
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+@metrics.timed("db")
+def daily_totals(start, end, barber_id=None):
+    """
+    Return one (date, bookings, revenue_cents, booked_minutes) row for every date
+    from start to end inclusive, with zeros for days without bookings.
+    """
+    dates = _dates(start, end)
+    if not dates:
+        return []
+    query = """
+        SELECT date, SUM(bookings), SUM(revenue_cents), SUM(booked_minutes) FROM daily_stats
+        WHERE date BETWEEN ? AND ?
+    """
+    params = [dates[0], dates[-1]]
+    if barber_id is not None:
+        query += " AND barber_id = ?"
+        params.append(barber_id)
+    with db.connection() as conn:
+        rows = {row[0]: row for row in conn.execute(query + " GROUP BY date", params)}
+    return [rows.get(d, (d, 0, 0, 0)) for d in dates]
+
+
+@metrics.timed("db")
+def _totals_by(column, start, end):
+    with db.connection() as conn:
+        return conn.execute(f"""
+            SELECT {column}, SUM(bookings), SUM(revenue_cents), SUM(booked_minutes) FROM daily_stats
+            WHERE date BETWEEN ? AND ? GROUP BY {column} ORDER BY SUM(revenue_cents) DESC
+        """, (db.normalize_date(start), db.normalize_date(end))).fetchall()
+
+
+def totals_by_service(start, end):
+    """Return (service, bookings, revenue_cents, booked_minutes) rows, highest revenue first."""
+    return _totals_by("service", start, end)
+
+
+def totals_by_barber(start, end):
+    """Return (barber_id, bookings, revenue_cents, booked_minutes) rows, highest revenue first."""
+    return _totals_by("barber_id", start, end)
+
+
+def available_minutes(start, end):
+    """
+    Return {barber_id: minutes of working hours from start to end inclusive}, from
+    the cached barber directory. Past dates use the hours as they are set today.
+    """
+    weekdays = [date.fromisoformat(d).weekday() for d in _dates(start, end)]
+    minutes = {}
+    for barber_id, barber in availability.get_barbers().items():
+        hours = barber["hours"]
+        minutes[barber_id] = sum(hours[w][1] - hours[w][0] for w in weekdays if w in hours)
+    return minutes
+
+
+def utilization(booked, available):
+    """Share of available minutes that were booked, or None when nobody was working."""
+    return booked / available if available else None
@@ -0,0 +1,46 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+# Point the app at a throwaway database before any repo module reads
+# BARBER_SHOP_DB, and keep notifications from being sent.
+_workdir = tempfile.mkdtemp(prefix="barber_shop_tests_")
+os.environ["BARBER_SHOP_DB"] = os.path.join(_workdir, "barber_shop.db")
+os.environ["BARBER_SHOP_NOTIFY"] = "none"
+os.environ["BARBER_SHOP_METRICS"] = "0"
+os.chdir(_workdir)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+import availability  # noqa: E402
+import catalog  # noqa: E402
+import db  # noqa: E402
+import migrations  # noqa: E402
+
+
+@pytest.fixture
+def shop():
+    """
+    A migrated database with no appointments, holds or queued messages, cold caches,
+    the manager as the only barber, working the default hours every day, and two
+    services: a 30 minute "Cut" for $20 and a 60 minute "Color" for $45.50.
+    """
+    migrations.migrate()
+    with db.transaction() as conn:
+        for table in ("appointments", "slot_holds", "outbox", "barber_hours"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.execute("DELETE FROM user_access_data WHERE login != 'manager'")
+        conn.execute("DELETE FROM services")
+        conn.executemany("""
+            INSERT INTO services (name, description, price, duration_minutes, price_cents) VALUES (?, '', ?, ?, ?)
+        """, [("Cut", "$20", 30, 2000), ("Color", "$45.50", 60, 4550)])
+        conn.execute("""
+            INSERT INTO barber_hours (barber_id, weekday, start_time, end_time)
+            SELECT id, weekday, ?, ? FROM user_access_data, (SELECT value AS weekday FROM json_each('[0,1,2,3,4,5,6]'))
+        """, (availability.DEFAULT_OPENING_TIME, availability.DEFAULT_CLOSING_TIME))
+    availability.clear_cache()
+    catalog.invalidate()
+    yield
+    availability.clear_cache()
@@ -0,0 +1,59 @@
+# tests/test_appointments.py
+import io
+from datetime import date, timedelta
+
+import availability
+import db
+from data.appointments import (SLOT_BOOKED, SLOT_HELD, SLOT_TAKEN, add_appointment, hold_slot, import_appointments_csv,
+                               reschedule_appointments, reserve_slot)
+
+DAY = date.today() + timedelta(days=3)
+
+
+def test_overlapping_booking_is_taken_but_touching_one_is_booked(shop):
+    assert reserve_slot("Ann", "ann@example.com", "Cut", DAY, "10:00")["status"] == SLOT_BOOKED
+    assert reserve_slot("Bo", "bo@example.com", "Cut", DAY, "10:15")["status"] == SLOT_TAKEN
+    assert reserve_slot("Bo", "bo@example.com", "Cut", DAY, "09:30")["status"] == SLOT_BOOKED
+    assert reserve_slot("Cy", "cy@example.com", "Cut", DAY, "10:30")["status"] == SLOT_BOOKED
+
+
+def test_booking_ending_at_closing_time_is_accepted(shop):
+    assert reserve_slot("Ann", "ann@example.com", "Cut", DAY, "17:30")["status"] == SLOT_BOOKED
+    assert reserve_slot("Bo", "bo@example.com", "Cut", DAY, "17:45")["status"] == SLOT_TAKEN
+
+
+def test_slot_held_by_another_session_is_reported_as_held(shop):
+    assert hold_slot(DAY, "10:00", "session-a") is not None
+    assert reserve_slot("Bo", "bo@example.com", "Cut", DAY, "10:00", token="session-b")["status"] == SLOT_HELD
+
+    booked = reserve_slot("Ann", "ann@example.com", "Cut", DAY, "10:00", token="session-a")
+    assert booked["status"] == SLOT_BOOKED
+    # Once booked the slot is taken, not held: the booking removed session-a's hold
+    assert reserve_slot("Bo", "bo@example.com", "Cut", DAY, "10:00", token="session-b")["status"] == SLOT_TAKEN
+
+
+def test_reschedule_onto_a_taken_slot_leaves_the_appointment_in_place(shop):
+    other_day = DAY + timedelta(days=1)
+    moving = add_appointment("Ann", "ann@example.com", "Cut", DAY, "10:00")
+    add_appointment("Bo", "bo@example.com", "Cut", other_day, "10:15")
+    free = add_appointment("Cy", "cy@example.com", "Cut", DAY, "11:00")
+
+    result = reschedule_appointments([moving, free], other_day)
+
+    assert result == {"moved": 1, "conflicts": [moving]}
+    assert availability.day_availability(DAY).get("10:00") is None  # Still booked on the original day
+    assert "11:00" in availability.free_slots(DAY)
+
+
+def test_import_reports_unknown_services_and_barbers(shop):
+    csv = ("name,contact,service,date,time,barber\n"
+           f"Ann,ann@example.com, cut ,{DAY.isoformat()},10:00,\n"
+           f"Bo,bo@example.com,Cutt,{DAY.isoformat()},11:00,\n"
+           f"Cy,cy@example.com,Color,{DAY.isoformat()},12:00,nobody\n")
+
+    result = import_appointments_csv(io.BytesIO(csv.encode()))
+
+    assert result["imported"] == 1
+    assert result["invalid"] == [(3, "Unknown service: 'Cutt'"), (4, "Unknown barber: 'nobody'")]
+    with db.connection() as conn:
+        assert conn.execute("SELECT service, price_cents, end_time FROM appointments").fetchall() == [("Cut", 2000, "10:30")]
@@ -0,0 +1,44 @@
+# tests/test_auth.py
+import auth
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_limiter_locks_out_after_max_failures(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(auth.time, "monotonic", clock)
+    limiter = auth.LoginRateLimiter(max_failures=3, window=60)
+    for _ in range(3):
+        limiter.record_failure("alice", "session")
+    assert limiter.retry_after("alice") == 61
+    clock.now += 61
+    assert limiter.retry_after("alice", "session") == 0
+
+
+def test_limiter_forgets_expired_keys(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(auth.time, "monotonic", clock)
+    limiter = auth.LoginRateLimiter(max_failures=3, window=60)
+    for i in range(100):
+        limiter.record_failure(f"random{i}")
+    clock.now += 61
+    limiter.record_failure("alice")
+    assert list(limiter._failures) == ["alice"]
+
+
+def test_limiter_caps_tracked_keys(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(auth.time, "monotonic", clock)
+    limiter = auth.LoginRateLimiter(max_failures=3, window=60, max_keys=10)
+    for _ in range(3):
+        limiter.record_failure("alice")
+    for i in range(50):
+        limiter.record_failure(f"random{i}")
+    assert len(limiter._failures) == 10
+    assert limiter.retry_after("alice") == 0  # Least recently failed, so dropped first
@@ -0,0 +1,47 @@
+# tests/test_availability.py
+from datetime import date, datetime, time, timedelta
+
+import availability
+from availability import free_starts, to_minutes
+
+
+def _starts(busy, duration=30, opening="09:00", closing="18:00", not_before=0):
+    return [availability.to_hhmm(m) for m in free_starts(
+        [(to_minutes(s), to_minutes(e)) for s, e in busy], to_minutes(opening), to_minutes(closing), duration,
+        not_before)]
+
+
+def test_gap_ending_where_a_booking_starts_is_usable():
+    starts = _starts([("10:00", "10:30")])
+    assert "09:30" in starts  # 09:30-10:00 touches the booking without overlapping it
+    assert "09:45" not in starts
+    assert "10:30" in starts  # Free again the minute the booking ends
+
+
+def test_back_to_back_bookings_leave_no_gap():
+    starts = _starts([("10:00", "10:30"), ("10:30", "11:00")])
+    assert not [s for s in starts if "09:30" < s < "11:00"]
+    assert "11:00" in starts
+
+
+def test_off_grid_booking_end_rounds_up_to_the_next_slot():
+    starts = _starts([("10:00", "10:40")])
+    assert "10:45" in starts and "10:30" not in starts
+
+
+def test_booking_may_end_exactly_at_closing_time():
+    starts = _starts([], duration=45)
+    assert starts[-1] == "17:15"
+    assert _starts([], duration=9 * 60) == ["09:00"]
+    assert _starts([], duration=9 * 60 + 15) == []
+
+
+def test_today_only_offers_slots_that_have_not_started(shop):
+    today = date.today()
+    assert availability.free_slots(today, now=datetime.combine(today, time(10, 7)))[0] == "10:15"
+    # A slot starting right now has already begun
+    assert availability.free_slots(today, now=datetime.combine(today, time(10, 0)))[0] == "10:15"
+    assert availability.free_slots(today, now=datetime.combine(today, time(9, 44)))[0] == "09:45"
+    # Other days are not cut off
+    tomorrow = today + timedelta(days=1)
+    assert availability.free_slots(tomorrow, now=datetime.combine(today, time(17, 0)))[0] == "09:00"
@@ -0,0 +1,39 @@
+# tests/test_export.py
+from datetime import date
+
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+import export
+import ui
+
+
+class _Column:
+    def __init__(self, buttons):
+        self.buttons = buttons
+
+    def download_button(self, label, data, **kwargs):
+        self.buttons[kwargs["file_name"]] = data
+
+
+class _Streamlit:
+    """Stands in for st inside ui.export_buttons and records each button's data."""
+
+    def __init__(self):
+        self.buttons = {}
+
+    def columns(self, n):
+        return [_Column(self.buttons) for _ in range(n)]
+
+
+@pytest.mark.parametrize("kind", list(export.EXPORTS))
+def test_download_callables_return_data_streamlit_accepts(shop, monkeypatch, kind):
+    fake = _Streamlit()
+    monkeypatch.setattr(ui, "st", fake)
+    ui.export_buttons(kind, date(2024, 1, 1), date(2024, 1, 31), key="test")
+
+    assert len(fake.buttons) == len(export.FORMATS)
+    for file_name, data in fake.buttons.items():
+        # What Streamlit does with a callable's result once the button is clicked
+        content, _ = convert_data_to_bytes_and_infer_mime(data(), unsupported_error=TypeError(file_name))
+        assert content
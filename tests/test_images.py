@@ -0,0 +1,57 @@
+# tests/test_images.py
+import io
+
+import pytest
+from PIL import Image
+from streamlit.elements.lib.image_utils import _ensure_image_size_and_format
+from streamlit.elements.lib.layout_utils import LayoutConfig
+
+import images
+
+
+def _png(size=(640, 480), color="white", mode="RGB"):
+    out = io.BytesIO()
+    Image.new(mode, size, color).save(out, "PNG")
+    return out.getvalue()
+
+
+def test_save_upload_writes_each_variant(tmp_path):
+    processed = images.save_upload(_png(), str(tmp_path))
+    assert (processed.width, processed.height) == (640, 480)
+    assert set(processed.paths) == set(images.VARIANTS)
+    with Image.open(processed.paths["thumb"]) as thumb:
+        assert max(thumb.size) == images.VARIANTS["thumb"]
+
+
+@pytest.mark.parametrize("data", [b"not an image", _png()[:200]], ids=["renamed", "truncated"])
+def test_save_upload_rejects_unreadable_files(tmp_path, data):
+    with pytest.raises(ValueError):
+        images.save_upload(data, str(tmp_path))
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("data, ext", [
+    (_png(), ".jpg"),
+    (_png(mode="RGBA", color=(255, 255, 255, 255)), ".jpg"),  # Alpha channel, but nothing transparent
+    (_png(mode="RGBA", color=(255, 0, 0, 128)), ".png"),
+], ids=["opaque", "opaque-rgba", "transparent"])
+def test_variants_are_sent_by_st_image_without_reencoding(tmp_path, data, ext):
+    processed = images.save_upload(data, str(tmp_path))
+    for path in processed.paths.values():
+        assert path.endswith(ext)
+        variant = images.read_bytes(path)
+        # What st.image(..., use_container_width=True, output_format=...) does with the bytes
+        sent = _ensure_image_size_and_format(variant, LayoutConfig(width="stretch"), images.output_format(path))
+        assert sent is variant
+
+
+def test_reencode_webp_variants_writes_every_variant(tmp_path):
+    for variant, size in images.VARIANTS.items():
+        Image.new("RGB", (size, size), "navy").save(tmp_path / f"0123456789abcdef_{variant}.webp", "WEBP")
+
+    new_path = images.reencode_webp_variants(str(tmp_path / "0123456789abcdef_display.webp"))
+
+    assert new_path == str(tmp_path / "0123456789abcdef_display.jpg")
+    assert images.variant_path(new_path, "thumb") == str(tmp_path / "0123456789abcdef_thumb.jpg")
+    with Image.open(images.variant_path(new_path, "thumb")) as thumb:
+        assert thumb.format == "JPEG"
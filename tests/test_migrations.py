@@ -0,0 +1,147 @@
+# tests/test_migrations.py
+import os
+import sqlite3
+
+import pytest
+from PIL import Image
+
+import images
+import migrations
+
+
+def _legacy_photo(folder, name="haircut.jpg"):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+    Image.new("RGB", (2000, 1500), "navy").save(path, "JPEG")
+    return path
+
+
+def test_gallery_table_indexes_resized_variants_of_legacy_photos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _legacy_photo("uploads/gallery")
+    conn = sqlite3.connect(":memory:")
+
+    migrations._gallery_table(conn)
+
+    (path, thumb_path, caption, width, height), = conn.execute(
+        "SELECT path, thumb_path, caption, width, height FROM gallery").fetchall()
+    assert images.is_variant(path) and images.is_variant(thumb_path) and path != thumb_path
+    assert (caption, width, height) == ("haircut.jpg", 2000, 1500)
+    with Image.open(thumb_path) as thumb:
+        assert max(thumb.size) == images.VARIANTS["thumb"]
+
+
+def test_gallery_variants_replaces_rows_indexed_as_is(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect(":memory:")
+    migrations._gallery_table(conn)
+    legacy = _legacy_photo("uploads/gallery")
+    conn.execute("INSERT INTO gallery (path, thumb_path, caption) VALUES (?, ?, 'old')", (legacy, legacy))
+    conn.execute("INSERT INTO gallery (path, thumb_path, caption) VALUES ('gone.jpg', 'gone.jpg', 'missing')")
+
+    migrations._gallery_variants(conn)
+
+    rows = dict(conn.execute("SELECT caption, thumb_path FROM gallery").fetchall())
+    assert images.is_variant(rows["old"])
+    assert rows["missing"] == "gone.jpg"
+    assert os.path.exists(legacy)
+
+
+def test_service_variants_resizes_legacy_service_images(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    legacy = _legacy_photo("uploads/services", "beard.jpg")
+    processed = images.save_upload(open(legacy, "rb").read(), "uploads/other")
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE services (id INTEGER PRIMARY KEY, name TEXT, image_path TEXT)")
+    conn.executemany("INSERT INTO services (name, image_path) VALUES (?, ?)",
+                     [("Beard", legacy), ("Gone", "uploads/services/gone.jpg"), ("New", processed.paths["display"]),
+                      ("None", None)])
+
+    migrations._service_variants(conn)
+
+    rows = dict(conn.execute("SELECT name, image_path FROM services").fetchall())
+    assert images.is_variant(rows["Beard"]) and os.path.dirname(rows["Beard"]) == "uploads/services"
+    with Image.open(rows["Beard"]) as display:
+        assert max(display.size) == images.VARIANTS["display"]
+    assert rows["Gone"] == "uploads/services/gone.jpg"
+    assert rows["New"] == processed.paths["display"]
+    assert rows["None"] is None
+    assert os.path.exists(legacy)
+
+
+def test_browser_image_formats_repoints_webp_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("uploads/gallery")
+    for variant, size in images.VARIANTS.items():
+        Image.new("RGB", (size, size), "navy").save(f"uploads/gallery/0123456789abcdef_{variant}.webp", "WEBP")
+    conn = sqlite3.connect(":memory:")
+    migrations._gallery_table(conn)
+    conn.execute("CREATE TABLE services (id INTEGER PRIMARY KEY, image_path TEXT)")
+    conn.execute("INSERT INTO gallery (path, thumb_path) VALUES (?, ?)",
+                 ("uploads/gallery/0123456789abcdef_display.webp", "uploads/gallery/0123456789abcdef_thumb.webp"))
+    conn.execute("INSERT INTO services (image_path) VALUES ('uploads/gallery/0123456789abcdef_display.webp')")
+
+    migrations._browser_image_formats(conn)
+
+    assert conn.execute("SELECT path, thumb_path FROM gallery").fetchone() == (
+        "uploads/gallery/0123456789abcdef_display.jpg", "uploads/gallery/0123456789abcdef_thumb.jpg")
+    assert conn.execute("SELECT image_path FROM services").fetchone() == ("uploads/gallery/0123456789abcdef_display.jpg",)
+
+
+def _migrated_to(version):
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    for step_version, step in migrations.MIGRATIONS:
+        if step_version > version:
+            break
+        step(conn)
+    return conn
+
+
+def test_index_appointments_normalizes_and_moves_rejected_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = _migrated_to(1)
+    conn.executemany("INSERT INTO appointments (name, contact, service, date, time) VALUES (?, ?, ?, ?, ?)", [
+        ("Ann", "ann@example.com", "Cut", "2024-12-25", "09:00"),
+        ("Bo", "bo@example.com", "Cut", "25/12/2024", "9:00 AM"),  # Same slot as Ann once normalized
+        ("Cy", "cy@example.com", "Cut", "tomorrow", "10:00"),
+        ("Di", "di@example.com", "Cut", "26.12.2024", "1430"),
+        ("Ed", "ed@example.com", "Cut", "2024-12-27", "10:00"),
+    ])
+    conn.execute("DELETE FROM appointments WHERE name = 'Ed'")
+
+    migrations._index_appointments(conn)
+
+    assert conn.execute("SELECT id, name, date, time FROM appointments ORDER BY id").fetchall() == [
+        (1, "Ann", "2024-12-25", "09:00"), (4, "Di", "2024-12-26", "14:30")]
+    assert conn.execute("SELECT id, name, date, time, reason FROM appointments_rejected ORDER BY id").fetchall() == [
+        (2, "Bo", "25/12/2024", "9:00 AM", "Slot already booked"),
+        (3, "Cy", "tomorrow", "10:00", "Unrecognised date: 'tomorrow'")]
+    # The id of the deleted row is not handed out again
+    assert conn.execute("INSERT INTO appointments (date, time) VALUES ('2024-12-28', '09:00')").lastrowid == 6
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO appointments (date, time) VALUES ('2024-12-25', '09:00')")
+
+
+
+def test_customers_backfill_groups_appointments_by_contact(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = _migrated_to(7)
+    conn.executemany("""
+        INSERT INTO appointments (name, contact, service, date, time, barber_id, end_time) VALUES (?, ?, 'Cut', ?, ?, 1, ?)
+    """, [
+        ("Ann Lee", " ANN@example.com", "2024-02-01", "09:00", "09:30"),
+        ("Ann", "ann@Example.com", "2024-01-01", "09:00", "09:30"),
+        ("Bo", "(11) 98765-4321", "2024-01-02", "10:00", "10:30"),
+        ("Bo", "11987654321", "2024-01-03", "10:00", "10:30"),
+        ("Walk-in", "", "2024-01-04", "11:00", "11:30"),
+    ])
+
+    migrations._customers(conn)
+
+    customers = {key: (id, name) for id, key, name in conn.execute("SELECT id, contact_key, name FROM customers")}
+    assert set(customers) == {"ann@example.com", "11987654321"}
+    assert customers["ann@example.com"][1] == "Ann Lee"  # Latest appointment's name
+    linked = dict(conn.execute("SELECT name || ' ' || date, customer_id FROM appointments").fetchall())
+    assert linked["Ann 2024-01-01"] == linked["Ann Lee 2024-02-01"] == customers["ann@example.com"][0]
+    assert linked["Bo 2024-01-02"] == linked["Bo 2024-01-03"] == customers["11987654321"][0]
+    assert linked["Walk-in 2024-01-04"] is None
@@ -0,0 +1,101 @@
+# tests/test_notifications.py
+import time
+from datetime import date, timedelta
+
+import pytest
+
+import db
+import notifications
+from data.appointments import add_appointment, remove_appoiments, reschedule_appointments
+
+DAY = date.today() + timedelta(days=3)
+
+
+def _outbox(*columns):
+    with db.connection() as conn:
+        return conn.execute(f"SELECT {', '.join(columns)} FROM outbox ORDER BY id").fetchall()
+
+
+def _book():
+    return add_appointment("Ann", "ann@example.com", "Cut", DAY, "10:00")
+
+
+def _fail(messages, error, now):
+    return notifications.record_results(messages, {m.id: error for m in messages}, now=now)
+
+
+def test_booking_queues_a_confirmation_now_and_a_reminder_later(shop):
+    _book()
+    assert [row[0] for row in _outbox("kind")] == ["confirmation", "reminder"]
+    claimed = notifications.claim(now=time.time() + 1)
+    assert [m.kind for m in claimed] == ["confirmation"]
+
+
+def test_retries_back_off_exponentially_then_fail(shop, monkeypatch):
+    monkeypatch.setattr(notifications.random, "uniform", lambda a, b: 1.0)
+    _book()
+    now = time.time() + 1
+    delays = []
+    for attempt in range(1, notifications.MAX_ATTEMPTS + 1):
+        messages = [m for m in notifications.claim(now=now) if m.kind == "confirmation"]
+        assert len(messages) == 1 and messages[0].attempts == attempt - 1
+        _fail(messages, notifications.SendError("server down"), now)
+        status, send_after, attempts = _outbox("status", "send_after", "attempts")[0]
+        assert attempts == attempt
+        if attempt < notifications.MAX_ATTEMPTS:
+            assert status == "pending"
+            delays.append(round(send_after - now))
+            now = send_after
+        else:
+            assert status == "failed"
+    base = notifications.BASE_BACKOFF
+    assert delays == [base * 2 ** i for i in range(notifications.MAX_ATTEMPTS - 1)]
+    assert notifications.recent_failures()[0][4] == "server down"
+
+
+def test_permanent_errors_are_not_retried(shop):
+    _book()
+    now = time.time() + 1
+    messages = notifications.claim(now=now)
+    assert _fail(messages, notifications.SendError("no such mailbox", permanent=True), now)["failed"] == 1
+    assert _outbox("status", "attempts")[0] == ("failed", 1)
+    assert notifications.claim(now=now + 3600) == []
+
+
+def test_expired_lease_is_reclaimed_and_the_old_worker_cannot_record(shop):
+    _book()
+    now = time.time() + 1
+    first = notifications.claim(now=now, lease=10)
+    assert notifications.claim(now=now + 5, lease=10) == []  # Still leased
+    second = notifications.claim(now=now + 11, lease=10)
+    assert [m.id for m in second] == [m.id for m in first]
+
+    late = notifications.record_results(first, {m.id: None for m in first}, now=now + 12)
+    assert late["lease_lost"] == 1 and late["sent"] == 0
+    assert _outbox("status")[0] == ("sending",)
+    assert notifications.record_results(second, {m.id: None for m in second}, now=now + 12)["sent"] == 1
+    assert _outbox("status")[0] == ("sent",)
+
+
+def test_worker_lease_outlasts_the_senders_slowest_batch():
+    sender = notifications.SMTPSender("mail.example.com", timeout=10)
+    worker = notifications.OutboxWorker(sender, batch_size=20)
+    assert worker.lease >= sender.max_seconds(20) + notifications.LEASE
+    assert notifications.OutboxWorker(notifications.FileSender("unused.log")).lease == notifications.LEASE
+
+
+@pytest.mark.parametrize("change", ["reschedule", "cancel"])
+def test_reminder_is_cancelled_when_the_appointment_changes(shop, change):
+    appointment_id = _book()
+    if change == "reschedule":
+        reschedule_appointments([appointment_id], DAY + timedelta(days=1))
+        expected = [("confirmation", "pending"), ("reminder", "cancelled"), ("reschedule", "pending"),
+                    ("reminder", "pending")]
+    else:
+        remove_appoiments(appointment_id)
+        expected = [("confirmation", "pending"), ("reminder", "cancelled"), ("cancellation", "pending")]
+    assert _outbox("kind", "status") == expected
+    if change == "reschedule":
+        (send_after,) = _outbox("send_after")[-1]
+        new_start = time.mktime((DAY + timedelta(days=1)).timetuple()) + 10 * 60 * 60
+        assert send_after == pytest.approx(new_start - notifications.REMINDER_LEAD)
@@ -0,0 +1,55 @@
+# tests/test_reports.py
+import io
+from datetime import date, timedelta
+
+import db
+import reports
+from data.appointments import (add_appointment, cancel_appointments_in_range, import_appointments_csv,
+                               remove_appoiments, reschedule_appointments)
+
+DAY = date.today() + timedelta(days=3)
+
+
+def _daily_stats():
+    with db.connection() as conn:
+        return conn.execute("""
+            SELECT date, barber_id, service, bookings, revenue_cents, booked_minutes FROM daily_stats
+            ORDER BY 1, 2, 3
+        """).fetchall()
+
+
+def _recomputed():
+    # What the triggers should have maintained, computed from scratch like migration 9's backfill
+    with db.connection() as conn:
+        return conn.execute("""
+            SELECT date, COALESCE(barber_id, 0), COALESCE(service, ''), COUNT(*), SUM(COALESCE(price_cents, 0)),
+                   SUM((strftime('%s', end_time) - strftime('%s', time)) / 60)
+            FROM appointments GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        """).fetchall()
+
+
+def test_daily_stats_triggers_match_the_appointments(shop):
+    cut = add_appointment("Ann", "ann@example.com", "Cut", DAY, "09:00")
+    color = add_appointment("Bo", "bo@example.com", "Color", DAY, "10:00")
+    add_appointment("Cy", "cy@example.com", "Cut", DAY, "11:00")
+    moved = add_appointment("Di", "di@example.com", "Color", DAY + timedelta(days=1), "09:00")
+    assert _daily_stats() == _recomputed()
+    assert (DAY.isoformat(), 1, "Color", 1, 4550, 60) in _daily_stats()
+
+    reschedule_appointments([moved, cut], DAY + timedelta(days=2))  # UPDATE OF date
+    remove_appoiments(color)
+    assert _daily_stats() == _recomputed()
+
+    csv = ("name,contact,service,date,time\n"
+           f"Ed,ed@example.com,Cut,{DAY.isoformat()},14:00\n"
+           f"Flo,flo@example.com,Color,{(DAY + timedelta(days=5)).isoformat()},15:00\n")
+    assert import_appointments_csv(io.BytesIO(csv.encode()))["imported"] == 2
+    assert _daily_stats() == _recomputed()
+
+    cancel_appointments_in_range(DAY + timedelta(days=5), DAY + timedelta(days=5))
+    assert _daily_stats() == _recomputed()
+    # Days whose last booking went away leave no row behind
+    assert (DAY + timedelta(days=5)).isoformat() not in {row[0] for row in _daily_stats()}
+
+    totals = reports.daily_totals(DAY, DAY + timedelta(days=2))
+    assert sum(day[2] for day in totals) == sum(row[4] for row in _recomputed())
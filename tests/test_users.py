@@ -0,0 +1,73 @@
+# tests/test_users.py
+from datetime import date, timedelta
+
+import pytest
+
+import db
+from data.appointments import add_appointment
+from data.users import StrandedAppointments, insert_employee_access, remove_employees_data, set_barber_hours
+
+
+def _barber(login="sam"):
+    insert_employee_access(login, "secret", "11999999999", f"{login}@example.com")
+    with db.connection() as conn:
+        return conn.execute("SELECT id FROM user_access_data WHERE login = ?", (login,)).fetchone()[0]
+
+
+def _rows(sql, *params):
+    with db.connection() as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def test_removing_a_barber_with_upcoming_appointments_is_refused(shop):
+    barber_id = _barber()
+    appointment_id = add_appointment("Ann", "ann@example.com", "Cut", date.today() + timedelta(days=2), "10:00", barber_id)
+
+    with pytest.raises(StrandedAppointments) as e:
+        remove_employees_data(barber_id)
+
+    assert e.value.ids == [appointment_id]
+    assert _rows("SELECT id FROM user_access_data WHERE id = ?", barber_id)
+    assert _rows("SELECT id FROM appointments WHERE id = ?", appointment_id)
+
+
+def test_removing_a_barber_can_cancel_their_upcoming_appointments(shop):
+    barber_id = _barber()
+    upcoming = add_appointment("Ann", "ann@example.com", "Cut", date.today() + timedelta(days=2), "10:00", barber_id)
+    with db.transaction() as conn:  # A past visit, kept for the reports
+        past = conn.execute("""
+            INSERT INTO appointments (name, contact, service, date, time, end_time, barber_id)
+            VALUES ('Bo', 'bo@example.com', 'Cut', ?, '10:00', '10:30', ?)
+        """, ((date.today() - timedelta(days=2)).isoformat(), barber_id)).lastrowid
+
+    remove_employees_data(barber_id, cancel_upcoming=True)
+
+    assert not _rows("SELECT id FROM user_access_data WHERE id = ?", barber_id)
+    assert [row[0] for row in _rows("SELECT id FROM appointments")] == [past]
+    assert _rows("SELECT 1 FROM outbox WHERE kind = 'cancellation' AND appointment_id = ?", upcoming)
+
+
+def test_shorter_hours_refuse_then_cancel_appointments_outside_them(shop):
+    barber_id = _barber()
+    day = date.today() + timedelta(days=2)
+    morning = add_appointment("Ann", "ann@example.com", "Cut", day, "09:00", barber_id)
+    evening = add_appointment("Bo", "bo@example.com", "Cut", day, "17:30", barber_id)
+    # Saving the same hours keeps a booking that ends exactly at closing time
+    set_barber_hours(barber_id, {weekday: ("09:00", "18:00") for weekday in range(7)})
+    hours = {weekday: ("09:00", "17:00") for weekday in range(7)}
+
+    with pytest.raises(StrandedAppointments) as e:
+        set_barber_hours(barber_id, hours)
+    assert e.value.ids == [evening]
+
+    set_barber_hours(barber_id, hours, cancel_stranded=True)
+    assert [row[0] for row in _rows("SELECT id FROM appointments")] == [morning]
+
+
+def test_a_day_off_strands_that_days_appointments(shop):
+    barber_id = _barber()
+    day = date.today() + timedelta(days=2)
+    add_appointment("Ann", "ann@example.com", "Cut", day, "10:00", barber_id)
+
+    with pytest.raises(StrandedAppointments):
+        set_barber_hours(barber_id, {weekday: ("09:00", "18:00") for weekday in range(7) if weekday != day.weekday()})
@@ -0,0 +1,103 @@
+# ui.py
+import uuid
+import streamlit as st
+import auth
+import db
+import export
+import metrics
+from data.appointments import release_hold
+from data.users import validate_login
+
+
+# Shared by every page: contact validation, flash messages, the login section
+# and download buttons. Page modules live in views/.
+
+phone_regex = r"\b\d{2}([8-9]\d{8}|[1-7]\d{7})\b"
+email_regex = r"^([A-Za-z0-9]+[._-])*[A-Za-z0-9]+@[A-Za-z0-9-]+(\.[A-Z|a-z]{2,})+$"
+
+
+# Flash messages: queued in session state and shown once on the next run, so a
+# handler can st.rerun() straight away instead of sleeping to keep a message visible.
+def flash(message, kind="success"):
+    """Queue a message for the next run. kind is "success", "info", "warning" or "error"."""
+    st.session_state.setdefault("flash_messages", []).append((kind, message))
+
+
+def show_flash_messages():
+    for kind, message in st.session_state.pop("flash_messages", []):
+        getattr(st, kind)(message)
+
+
+# Session handling. A successful login stores a signed token in session state;
+# every rerun re-derives the user's id, role and name from it in memory.
+def _set_session_user(user):
+    st.session_state.logged_in = user is not None
+    st.session_state.user_id = user["id"] if user else None
+    st.session_state.user_role = user["role"] if user else None  # Store user role
+    st.session_state.user_name = user["name"] if user else None  # Store user name
+
+
+def restore_session():
+    """Refresh the login fields from the session token, logging out if it expired or was tampered with."""
+    token = st.session_state.get("auth_token")
+    user = auth.verify_token(token)
+    if token and not user:
+        st.session_state.pop("auth_token", None)
+        flash("Your session has expired. Please log in again.", "info")
+    _set_session_user(user)
+
+
+def release_booking_hold():
+    """Give back the slot this session holds on the booking page, if any."""
+    if st.session_state.pop("booking_hold", None) is not None:
+        release_hold(st.session_state.booking_token)
+
+
+# Login/Logout Section at the top-left
+@metrics.timed("page")
+def login_section():
+    if st.session_state.get("logged_in", False):
+        st.sidebar.write(f"Logged in as {st.session_state.user_role.capitalize()}")
+        if st.sidebar.button("Log Out"):
+            st.session_state.pop("auth_token", None)
+            _set_session_user(None)
+            flash("Successfully logged out.")
+            st.rerun()
+    else:
+        st.sidebar.write("Manager Login")
+        username = st.sidebar.text_input("Username")
+        password = st.sidebar.text_input("Password", type="password")
+        if st.sidebar.button("Login"):
+            # Failed attempts are limited per username and per browser session before touching the database
+            session_key = ("session", st.session_state.setdefault("session_id", uuid.uuid4().hex))
+            user_key = ("login", username.strip().lower())
+            wait = auth.login_limiter.retry_after(session_key, user_key)
+            if wait:
+                st.sidebar.error(f"Too many failed attempts. Please try again in {wait} seconds.")
+                return
+            if not auth.login_slots.acquire(timeout=5):
+                st.sidebar.error("The server is busy. Please try again in a moment.")
+                return
+            try:
+                with db.connection() as conn:
+                    user = validate_login(conn.cursor(), username, password)
+            finally:
+                auth.login_slots.release()
+            if user:
+                auth.login_limiter.reset(session_key, user_key)
+                st.session_state.auth_token = auth.issue_token(user)
+                _set_session_user(user)
+                flash(f"Welcome, {user['name'] or user['login']}!")
+                st.rerun()
+            else:
+                auth.login_limiter.record_failure(session_key, user_key)
+                st.sidebar.error("Invalid credentials. Please try again.")
+
+
+def export_buttons(kind, start_date, end_date, key):
+    """Download buttons for an export.py export; the file is only generated when a button is clicked."""
+    file_name = f"{kind}_{start_date or 'start'}_{end_date or 'end'}"
+    cols = st.columns(len(export.FORMATS))
+    for col, (fmt, mime) in zip(cols, export.FORMATS.items()):
+        col.download_button(f"⬇️ Download {fmt.upper()}", lambda fmt=fmt: export.export_bytes(kind, fmt, start_date, end_date),
+                            file_name=f"{file_name}.{fmt}", mime=mime, on_click="ignore", key=f"{key}_{fmt}")
@@ -0,0 +1,46 @@
+# views/__init__.py
+import importlib
+from collections import namedtuple
+
+
+# Page registry. Each page's module is imported the first time the page is
+# selected, so start-up only loads the pages a visitor actually opens and a new
+# page costs nothing until then. (Not named pages/: Streamlit would turn that
+# folder into its own multipage navigation.)
+
+Page = namedtuple("Page", ["title", "module", "function", "roles", "in_menu"])
+
+ANYONE = None  # roles value for public pages
+STAFF = ("manager", "employee")
+MANAGER = ("manager",)
+
+PAGES = (
+    Page("Home", "views.home", "home_page", ANYONE, True),
+    Page("Services", "views.services", "services_page", ANYONE, True),
+    Page("Book Appointment", "views.booking", "booking_page", ANYONE, True),
+    Page("Gallery", "views.gallery", "gallery_page", ANYONE, True),
+    Page("Manage Appointments", "views.manage", "manage_appointments_page", STAFF, True),
+    Page("Reports", "views.reporting", "reports_page", MANAGER, True),
+    Page("Diagnostics", "views.diagnostics", "diagnostics_page", MANAGER, True),
+    Page("User Management", "views.users", "user_management_page", MANAGER, True),
+    Page("Edit Profile", "views.profile", "edit_profile_page", STAFF, False),
+    Page("Contact Us", "views.contact", "contact_page", ANYONE, True),
+)
+_by_title = {page.title: page for page in PAGES}
+
+
+def allowed(page, role):
+    return page.roles is ANYONE or role in page.roles
+
+
+def menu(role):
+    """Titles of the sidebar pages a user with role (None when logged out) may open, in order."""
+    return [page.title for page in PAGES if page.in_menu and allowed(page, role)]
+
+
+def render(title, role):
+    """Import the page's module if needed and draw it. Unknown titles and pages role may not open draw nothing."""
+    page = _by_title.get(title)
+    if page is None or not allowed(page, role):
+        return
+    getattr(importlib.import_module(page.module), page.function)()
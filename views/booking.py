@@ -0,0 +1,127 @@
+# views/booking.py
+import re
+import uuid
+from datetime import datetime
+import streamlit as st
+import availability
+import catalog
+import metrics
+from data.appointments import HOLD_SECONDS, SLOT_BOOKED, get_holds, hold_slot, reserve_slot
+from ui import email_regex, flash, phone_regex, release_booking_hold
+
+
+# Booking Page
+def _select_first_available(duration, barber_id):
+    """Button callback: preselect the earliest open slot from today onwards."""
+    first = availability.next_free_slots(datetime.now().date(), limit=1, duration=duration, barber_id=barber_id)
+    if first:
+        day, slot = first[0]
+        st.session_state.booking_date = datetime.strptime(day, "%Y-%m-%d").date()
+        st.session_state.booking_time = slot
+    else:
+        st.session_state.pop("booking_time", None)
+
+
+def _clear_booking_time():
+    """Widget callback: a new service, barber or date invalidates the picked time and its hold."""
+    st.session_state.pop("booking_time", None)
+    release_booking_hold()
+
+
+@metrics.timed("page")
+def booking_page():
+
+    st.header("Book an Appointment")
+    st.write("Select your preferred service, barber, date, and time.")
+
+    # Services and prices come from the cached catalog, not SQLite
+    services = catalog.get_catalog()
+    barbers = availability.get_barbers()
+    if not services or not barbers:
+        st.write("No services available. Please check back later.")
+        return
+    selected_service = st.selectbox("Choose a Service", list(services), on_change=_clear_booking_time)
+    selected_price = services[selected_service].price
+    duration = services[selected_service].duration
+
+    # Display the price as a read-only field
+    st.text_input("Price", value=f"${selected_price}", disabled=True)   
+    barber_id = st.selectbox("Choose a Barber", [None] + list(barbers),
+                             format_func=lambda bid: "Any barber" if bid is None else barbers[bid]["name"],
+                             on_change=_clear_booking_time)
+    st.button("Jump to First Available", on_click=_select_first_available, args=(duration, barber_id))
+    date = st.date_input("Select Date", min_value=datetime.now().date(), key="booking_date",
+                         on_change=_clear_booking_time)
+
+    # Week at a glance from the selected date, loaded with a single range query
+    with st.expander("Week at a glance"):
+        week = availability.range_availability(date, 7, duration, barber_id=barber_id)
+        times = sorted({slot for slots in week.values() for slot in slots})
+        grid = {"Time": times}
+        for day, slots in week.items():
+            label = datetime.strptime(day, "%Y-%m-%d").strftime("%a %d/%m")
+            grid[label] = [f"✅ {len(slots[t])}" if t in slots else "—" for t in times]
+        st.dataframe(grid, hide_index=True, use_container_width=True)
+
+    # Free slots for the selected date, computed in memory from the cached bookings,
+    # treating slots other customers are holding right now as busy
+    token = st.session_state.setdefault("booking_token", uuid.uuid4().hex)
+    available_times = availability.free_slots(date, duration, holds=get_holds(date, token), barber_id=barber_id)
+
+    # Check if there are any available times
+    if available_times:
+        if st.session_state.get("booking_time") not in available_times:
+            st.session_state.pop("booking_time", None)  # Stale pick, e.g. the slot was just booked
+        # Display the available times as a select box, formatted as HH:MM. Nothing is
+        # preselected, so a slot is only held once the customer actually picks it.
+        timestamp = st.selectbox("Select Available Time", available_times, index=None,
+                                 placeholder="Choose a time", key="booking_time")
+        if timestamp is None:
+            release_booking_hold()
+            st.info(f"Pick a time and it is held for you for {HOLD_SECONDS // 60} minutes while you enter your details.")
+            return
+
+        # Hold the chosen slot while the form is filled in; renewed when half the hold has passed
+        hold = (date, timestamp, duration, barber_id)
+        renew_at = st.session_state.get("booking_hold_renew_at", 0)
+        if st.session_state.get("booking_hold") != hold or datetime.now().timestamp() >= renew_at:
+            held_barber = hold_slot(date, timestamp, token, duration, barber_id)
+            if held_barber is None:
+                st.session_state.pop("booking_hold", None)
+                st.warning("Another customer is booking this time right now. Please choose another one.")
+                return
+            st.session_state.booking_hold = hold
+            st.session_state.booking_hold_barber = held_barber
+            st.session_state.booking_hold_renew_at = datetime.now().timestamp() + HOLD_SECONDS / 2
+        held_barber = st.session_state.booking_hold_barber
+        st.caption(f"Your barber: {barbers[held_barber]['name'] if held_barber in barbers else 'to be confirmed'}"
+                   f" · {timestamp}–{availability.end_time(timestamp, duration)}")
+    else:
+        # Custom message if no times are available
+        st.warning("No available time slots for the selected date. Please choose a different date.")
+        release_booking_hold()
+        return  # Exit if no times are available
+
+    name = st.text_input("Your Name")
+    if not name:
+        st.warning("Please enter your name.")
+    contact = st.text_input("Contact Information (Phone or Email)")
+    if contact:
+        if re.match(phone_regex, contact) or (re.match(email_regex, contact)):
+            st.success("Contact information is valid.")
+        else:
+            st.error("Invalid contact information. Please enter a valid phone number or email address.")
+
+    if st.button("Book Appointment"):
+        if not name or not contact:
+            st.error("Please fill out all fields.")
+        else:
+            result = reserve_slot(name, contact, selected_service, date, timestamp, token, barber_id)
+            st.session_state.pop("booking_hold", None)
+            if result["status"] != SLOT_BOOKED:  # Someone else got the slot since the page was rendered
+                st.error(f"Sorry, {date} at {timestamp} was just booked. Please choose another time.")
+                return
+            st.session_state.pop("booking_time", None)  # The next booking starts from a fresh pick
+            barber_name = barbers.get(result["barber_id"], {}).get("name", "our team")
+            flash(f"Appointment booked for {name} on {date} at {timestamp} with {barber_name} for a {selected_service}.")
+            st.rerun()  # Re-render with the slot gone from the list
@@ -0,0 +1,42 @@
+# views/contact.py
+import re
+import streamlit as st
+import metrics
+from data.shop import get_barber_shop_info, insert_barber_shop_info, update_barber_shop_info
+from ui import email_regex, flash, phone_regex
+
+
+# Contact Page
+@metrics.timed("page")
+def contact_page():
+    st.header("Contact Us")
+    st.write("Feel free to reach out!")
+    
+    barber_shop_data = get_barber_shop_info()
+    if barber_shop_data:
+        for info in barber_shop_data:  # Display the contact information
+            st.write(f"📍 Address: {info[1]}" if info[1] else "Address not registred.")
+            st.write(f"📞 Phone: {info[2]}" if info[2] else "Phone not registred.")
+            st.write(f"📞 Cellphone: {info[3]}" if info[3] else "Cellphone not registred.")
+            st.write(f"📧 Email: {info[4]}" if info[4] else "Email not registred.")
+
+    if st.session_state.logged_in and st.session_state.user_role == "manager":
+        st.subheader("Manage Contact Data")
+        insert_address = st.text_input("Insert Address")
+        insert_phone = st.text_input("Insert Phone")
+        insert_cellphone = st.text_input("Insert Cellphone")
+        insert_mail = st.text_input("Insert Email")
+        if re.match(phone_regex, insert_cellphone) and (re.match(email_regex, insert_mail)):
+            st.success("Contact information is valid.")
+        else:
+            st.error("Invalid contact information. Please enter a valid phone number or email address.")
+        if st.button("Update Contact Data"):
+                barber_shop_infos = get_barber_shop_info()
+                if not barber_shop_infos:
+                    insert_barber_shop_info(insert_address, insert_phone, insert_cellphone, insert_mail)
+                    flash("Contact data inserted successfully!")
+                    st.rerun()  # Refresh the page to show the new contact data
+                else:
+                    update_barber_shop_info(insert_address, insert_phone, insert_cellphone, insert_mail)
+                    flash("Contact data updated successfully!")
+                    st.rerun()  # Refresh the page to show the new contact data
@@ -0,0 +1,82 @@
+# views/diagnostics.py
+import json
+from datetime import datetime
+import streamlit as st
+import db
+import metrics
+import notifications
+from ui import flash
+
+
+# Diagnostics (manager only): process-wide timings collected by metrics.py
+@metrics.timed("page")
+def diagnostics_page():
+    st.header("Diagnostics")
+    snapshot = metrics.snapshot()
+    counters, histograms = snapshot["counters"], snapshot["histograms"]
+    st.caption(f"Collected by this server process since {datetime.fromtimestamp(snapshot['since']):%Y-%m-%d %H:%M:%S}."
+               + ("" if metrics.ENABLED else " Instrumentation is disabled (BARBER_SHOP_METRICS=0)."))
+
+    reruns = counters.get("reruns", 0)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Reruns", reruns)
+    col2.metric("SQL statements", counters.get("db.statements", 0))
+    col3.metric("Statements per rerun", f"{histograms['statements_per_rerun']['mean']:.1f}"
+                if "statements_per_rerun" in histograms else "—")
+    col4.metric("Connections opened", counters.get("db.connections_opened", 0), help=f"Pool size: {db.POOL_SIZE}")
+
+    st.subheader("Recent Reruns")
+    recent = snapshot["recent_reruns"][::-1]
+    st.dataframe({
+        "At": [f"{datetime.fromtimestamp(r['at']):%H:%M:%S}" for r in recent],
+        "Page": [r["page"] for r in recent],
+        "Total (ms)": [r["ms"] for r in recent],
+        "SQLite (ms)": [r["groups_ms"].get("db", 0.0) for r in recent],
+        "Images (ms)": [r["groups_ms"].get("images", 0.0) for r in recent],
+        "Rendering (ms)": [round(r["ms"] - r["groups_ms"].get("db", 0.0) - r["groups_ms"].get("images", 0.0), 2)
+                           for r in recent],
+        "Statements": [r["statements"] for r in recent],
+    }, hide_index=True, use_container_width=True)
+
+    st.subheader("Latency (ms)")
+    timings = {name: h for name, h in histograms.items() if name != "statements_per_rerun"}
+    st.dataframe({
+        "Name": list(timings),
+        "Calls": [h["count"] for h in timings.values()],
+        "Mean": [round(h["mean"], 2) for h in timings.values()],
+        "p50 ≤": [round(h["p50"], 2) for h in timings.values()],
+        "p95 ≤": [round(h["p95"], 2) for h in timings.values()],
+        "Max": [round(h["max"], 2) for h in timings.values()],
+    }, hide_index=True, use_container_width=True)
+    if histograms:
+        name = st.selectbox("Histogram", list(histograms), key="diagnostics_histogram")
+        buckets = histograms[name]["buckets"]
+        st.bar_chart({"Bucket": list(buckets), "Count": list(buckets.values())}, x="Bucket", y="Count")
+
+    st.subheader("Notifications")
+    outbox = notifications.outbox_counts()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Pending", outbox.get("pending", 0) + outbox.get("sending", 0))
+    col2.metric("Sent", outbox.get("sent", 0))
+    col3.metric("Failed", outbox.get("failed", 0), help=f"Given up after {notifications.MAX_ATTEMPTS} attempts")
+    col4.metric("Cancelled", outbox.get("cancelled", 0))
+    # Only the scheme: an SMTP URL may carry a password
+    st.caption(f"Sender: {notifications.NOTIFY_URL.split(':', 1)[0]}"
+               + ("" if notifications.START_WORKER else " (worker runs outside the app)"))
+    failures = notifications.recent_failures()
+    if failures:
+        st.dataframe({
+            "ID": [f[0] for f in failures],
+            "Kind": [f[1] for f in failures],
+            "Recipient": [f[2] for f in failures],
+            "Attempts": [f[3] for f in failures],
+            "Last error": [f[4] for f in failures],
+        }, hide_index=True, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    col1.download_button("⬇️ Download JSON", json.dumps(snapshot, indent=2), file_name="diagnostics.json",
+                         mime="application/json", on_click="ignore")
+    if col2.button("Reset Counters"):
+        metrics.reset()
+        flash("Diagnostics counters reset.")
+        st.rerun()
@@ -0,0 +1,40 @@
+# views/gallery.py
+import streamlit as st
+import images
+import metrics
+from data.gallery import count_gallery_images, get_gallery_images
+
+
+GALLERY_PAGE_SIZE = 12
+GALLERY_COLUMNS = 3
+
+
+# Gallery Page
+@metrics.timed("page")
+def gallery_page():
+    st.header("Gallery")
+    st.write("Take a look at some of our work.")
+    # Only the first GALLERY_PAGE_SIZE thumbnails are loaded; "Load more" fetches the next page
+    shown = st.session_state.setdefault("gallery_shown", GALLERY_PAGE_SIZE)
+    gallery_images = get_gallery_images(shown)
+    if gallery_images:
+        # The full-size variant is only sent for the picture the visitor chose to view
+        selected = st.session_state.get("gallery_selected")
+        for image_id, path, thumb_path, caption in gallery_images:
+            if image_id == selected:
+                st.image(images.read_bytes(path), caption=caption, use_container_width=True,
+                         output_format=images.output_format(path))
+        columns = st.columns(GALLERY_COLUMNS)
+        for i, (image_id, path, thumb_path, caption) in enumerate(gallery_images):
+            with columns[i % GALLERY_COLUMNS]:
+                st.image(images.read_bytes(thumb_path), caption=caption, use_container_width=True,
+                         output_format=images.output_format(thumb_path))
+                if st.button("View", key=f"view_{image_id}", use_container_width=True):
+                    st.session_state.gallery_selected = image_id
+                    st.rerun()
+        if len(gallery_images) == shown and count_gallery_images() > shown:
+            if st.button("Load more"):
+                st.session_state.gallery_shown = shown + GALLERY_PAGE_SIZE
+                st.rerun()
+    else:
+        st.write("No images available in the gallery.")
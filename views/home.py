@@ -0,0 +1,13 @@
+# views/home.py
+import streamlit as st
+import images
+import metrics
+
+
+@metrics.timed("page")
+def home_page():
+    st.title("Welcome to Our Barber Shop 💈")
+
+    st.write("High-quality grooming services for the modern gentleman. Book an appointment, explore our services, and get to know us!")
+    st.image(images.read_bytes("uploads/main_page/barber_shop_image.jpg"), use_container_width=True,
+             output_format="JPEG")  # Replace with your own image
@@ -0,0 +1,168 @@
+# views/manage.py
+from datetime import datetime
+import streamlit as st
+import availability
+import catalog
+import images
+import metrics
+from data.appointments import (cancel_appointments_in_range, count_appointments, import_appointments_csv,
+                               query_appointments, remove_appointments, reschedule_appointments)
+from data.customers import get_customer_history, search_customers
+from data.gallery import add_gallery_image
+from data.services import add_service
+from ui import export_buttons, flash
+
+
+APPOINTMENTS_PAGE_SIZE = 50
+
+
+# Appointment Management Page and Service Management (Restricted Access)
+def _finish_bulk_action(notice):
+    """Flash the result summary and rerun with a fresh table selection."""
+    flash(notice)
+    st.session_state.appt_table_version = st.session_state.get("appt_table_version", 0) + 1
+    st.rerun()
+
+
+@metrics.timed("page")
+def manage_appointments_page():
+    st.header("Manage Appointments & Services")
+    
+    # Appointment Management
+    st.subheader("Appointments")
+    # Filters are applied in SQLite; only one page of rows is ever loaded
+    col1, col2, col3, col4 = st.columns(4)
+    start_date = col1.date_input("From", value=datetime.now().date(), key="appt_from")
+    end_date = col2.date_input("To", value=None, key="appt_to")
+    service = col3.selectbox("Service", ["All services"] + list(catalog.get_catalog()), key="appt_service")
+    search = col4.text_input("Client search", key="appt_search")
+    filters = dict(start_date=start_date, end_date=end_date,
+                   service=None if service == "All services" else service, search=search)
+
+    total = count_appointments(**filters)
+    pages = max(1, -(-total // APPOINTMENTS_PAGE_SIZE))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="appt_page")
+    appointments = query_appointments(**filters, limit=APPOINTMENTS_PAGE_SIZE,
+                                      offset=(page - 1) * APPOINTMENTS_PAGE_SIZE)
+
+    if appointments:
+        st.caption(f"{total} appointment(s) match the filters.")
+        barbers = availability.get_barbers()
+        table = {
+            "Select": [False] * len(appointments),
+            "ID": [appt[0] for appt in appointments],
+            "Date": [appt[4] for appt in appointments],
+            "Time": [f"{appt[5]}–{appt[7]}" for appt in appointments],
+            "Client Name": [appt[1] for appt in appointments],
+            "Contact": [appt[2] for appt in appointments],
+            "Service": [appt[3] for appt in appointments],
+            "Barber": [barbers[appt[6]]["name"] if appt[6] in barbers else "—" for appt in appointments],
+        }
+        # A new key after each bulk action so old checkbox state is not applied to new rows
+        edited = st.data_editor(table, hide_index=True, use_container_width=True,
+                                disabled=[column for column in table if column != "Select"],
+                                key=f"appt_table_{st.session_state.get('appt_table_version', 0)}")
+        selected = [appt_id for appt_id, checked in zip(edited["ID"], edited["Select"]) if checked]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button(f"❌ Remove Selected ({len(selected)})", disabled=not selected):
+                removed = remove_appointments(selected)
+                _finish_bulk_action(f"{removed} appointment(s) removed successfully!")
+        with col2:
+            new_date = st.date_input("Reschedule selected to", value=None, min_value=datetime.now().date(),
+                                     key="appt_new_date")
+            if st.button(f"📅 Reschedule Selected ({len(selected)})", disabled=not (selected and new_date)):
+                result = reschedule_appointments(selected, new_date)
+                notice = f"{result['moved']} appointment(s) moved to {new_date}."
+                if result["conflicts"]:
+                    notice += (f" {len(result['conflicts'])} kept their original date because the slot was taken"
+                               f" (IDs: {', '.join(map(str, result['conflicts']))}).")
+                _finish_bulk_action(notice)
+    else:
+        st.write("No appointments match the filters.")
+
+    with st.expander("Export"):
+        st.write("Appointments matching the date filters above, whatever the other filters.")
+        export_buttons("appointments", start_date, end_date, key="export_appointments")
+
+    with st.expander("Bulk Actions"):
+        st.write("**Cancel all appointments in a date range**")
+        col1, col2 = st.columns(2)
+        cancel_from = col1.date_input("Cancel from", value=None, key="cancel_from")
+        cancel_to = col2.date_input("Cancel to", value=None, key="cancel_to")
+        confirm = st.checkbox("I understand these appointments will be deleted", key="cancel_confirm")
+        if st.button("Cancel Appointments", disabled=not (cancel_from and cancel_to and confirm)):
+            result = cancel_appointments_in_range(cancel_from, cancel_to)
+            _finish_bulk_action(f"{result['cancelled']} appointment(s) from {cancel_from} to {cancel_to} cancelled.")
+
+        st.write("**Import bookings from CSV** (columns: name, contact, service, date, time; optional barber). "
+                 "Services must match the service list.")
+        bookings_csv = st.file_uploader("Bookings CSV", type=["csv"], key="import_csv")
+        if st.button("Import Bookings", disabled=bookings_csv is None):
+            result = import_appointments_csv(bookings_csv)
+            notice = f"{result['imported']} booking(s) imported."
+            if result["taken"]:
+                notice += f" {result['taken']} skipped because the slot was already booked."
+            if result["invalid"]:
+                notice += " Invalid rows: " + "; ".join(f"line {line}: {reason}" for line, reason in result["invalid"][:10])
+            _finish_bulk_action(notice)
+
+    # Customer lookup: indexed prefix search, then the chosen customer's visit history
+    st.subheader("Customers")
+    query = st.text_input("Search by name, phone or email (start of)", key="customer_search")
+    customers = search_customers(query)
+    if customers:
+        customer = st.selectbox("Customer", customers, key="customer_pick",
+                                format_func=lambda c: f"{c[1]} · {c[2]} · {c[3]} visit(s), last {c[4] or '—'}")
+        history = get_customer_history(customer[0])
+        barbers = availability.get_barbers()
+        st.dataframe({
+            "Date": [visit[1] for visit in history],
+            "Time": [visit[2] for visit in history],
+            "Service": [visit[3] for visit in history],
+            "Barber": [barbers[visit[4]]["name"] if visit[4] in barbers else "—" for visit in history],
+        }, hide_index=True, use_container_width=True)
+    elif query:
+        st.write("No customers found.")
+    if st.session_state.user_role == "manager":
+        # Service Management
+        st.subheader("Manage Services")
+        service_name = st.text_input("Service Name")
+        service_description = st.text_area("Service Description")
+        service_price = st.text_input("Service Price")
+        service_duration = st.number_input("Duration (minutes)", min_value=availability.SLOT_STEP, max_value=480,
+                                           value=availability.DEFAULT_DURATION, step=availability.SLOT_STEP)
+        service_image = st.file_uploader("Upload Image", type=["jpg", "jpeg", "png"])
+        
+        if st.button("Add Service"):
+            if service_name and service_description and service_price and service_image:
+                # Store resized variants; the display variant is the one referenced by the service
+                try:
+                    processed = images.save_upload(service_image.getvalue(), "uploads/services")
+                except ValueError:
+                    st.error("The uploaded file could not be read as an image. Please upload a JPG or PNG.")
+                else:
+                    add_service(service_name, service_description, service_price, processed.paths["display"],
+                                int(service_duration))
+                    st.success(f"Service '{service_name}' added successfully!")
+            else:
+                st.error("Please fill out all fields and upload an image.")
+        
+        # Gallery Image Upload Section
+        st.subheader("Manage Gallery Images")
+        uploaded_image = st.file_uploader("Choose an image for the gallery", type=["jpg", "jpeg", "png"])
+        image_caption = st.text_input("Image Caption")
+        
+        if st.button("Add to Gallery"):
+            if uploaded_image and image_caption:
+                # Save resized variants of the uploaded image to the gallery folder and index them
+                try:
+                    processed = images.save_upload(uploaded_image.getvalue(), "uploads/gallery")
+                except ValueError:
+                    st.error("The uploaded file could not be read as an image. Please upload a JPG or PNG.")
+                else:
+                    add_gallery_image(processed, image_caption)
+                    st.success("Image uploaded successfully to the gallery!")
+            else:
+                st.error("Please upload an image and enter a caption.")
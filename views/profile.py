@@ -0,0 +1,27 @@
+# views/profile.py
+import streamlit as st
+import metrics
+from data.users import get_user_profile, update_employee_access
+
+
+@metrics.timed("page")
+def edit_profile_page():
+    st.title("Edit Profile")
+    user_id = st.session_state.user_id  # Assuming user_id is stored in session_state during login
+
+    # Get user details
+    user = get_user_profile(user_id)
+
+    if user:
+        ename = st.text_input("Name", value=user[0], key="edit_name")
+        ecell = st.text_input("Phone", value=user[1], key="edit_phone")
+        email = st.text_input("Email", value=user[2], key="edit_email")
+        epass = st.text_input("Password", type="password", key="edit_password")
+
+        if st.button("Update Profile"):
+            if ename and ecell and email and epass:
+                update_employee_access(ename, epass, ecell, email, user_id)
+                st.success("Profile updated successfully!")
+                # st.rerun()
+            else:
+                st.error("Please fill out all fields.")
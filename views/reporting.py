@@ -0,0 +1,65 @@
+# views/reporting.py
+from datetime import datetime
+import streamlit as st
+import availability
+import metrics
+import reports
+from ui import export_buttons
+
+
+# Reports (manager only), read from the daily_stats aggregate
+@metrics.timed("page")
+def reports_page():
+    st.header("Reports")
+    col1, col2 = st.columns(2)
+    today = datetime.now().date()
+    start_date = col1.date_input("From", value=today.replace(day=1), key="report_from")
+    end_date = col2.date_input("To", value=today, key="report_to")
+    if start_date > end_date:
+        st.error("The start date must be before the end date.")
+        return
+
+    days = reports.daily_totals(start_date, end_date)
+    bookings = sum(day[1] for day in days)
+    revenue = sum(day[2] for day in days)
+    available = reports.available_minutes(start_date, end_date)
+    shop_utilization = reports.utilization(sum(day[3] for day in days), sum(available.values()))
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Bookings", bookings)
+    col2.metric("Revenue", reports.format_cents(revenue))
+    col3.metric("Average ticket", reports.format_cents(revenue / bookings if bookings else 0))
+    col4.metric("Utilization", f"{shop_utilization:.0%}" if shop_utilization is not None else "—")
+
+    st.subheader("Daily Revenue")
+    st.bar_chart({"Date": [day[0] for day in days], "Revenue ($)": [day[2] / 100 for day in days]},
+                 x="Date", y="Revenue ($)")
+    st.subheader("Daily Bookings")
+    st.line_chart({"Date": [day[0] for day in days], "Bookings": [day[1] for day in days]}, x="Date", y="Bookings")
+
+    st.subheader("By Service")
+    services = reports.totals_by_service(start_date, end_date)
+    st.dataframe({
+        "Service": [row[0] or "—" for row in services],
+        "Bookings": [row[1] for row in services],
+        "Revenue": [reports.format_cents(row[2]) for row in services],
+        "Hours booked": [round(row[3] / 60, 1) for row in services],
+    }, hide_index=True, use_container_width=True)
+
+    st.subheader("By Barber")
+    barbers = availability.get_barbers()
+    booked_by_barber = {row[0]: row for row in reports.totals_by_barber(start_date, end_date)}
+    barber_ids = list(dict.fromkeys(list(booked_by_barber) + list(available)))
+    rows = [booked_by_barber.get(barber_id, (barber_id, 0, 0, 0)) for barber_id in barber_ids]
+    st.dataframe({
+        "Barber": [barbers[row[0]]["name"] if row[0] in barbers else "—" for row in rows],
+        "Bookings": [row[1] for row in rows],
+        "Revenue": [reports.format_cents(row[2]) for row in rows],
+        "Hours booked": [round(row[3] / 60, 1) for row in rows],
+        "Utilization": [f"{u:.0%}" if u is not None else "—"
+                        for u in (reports.utilization(row[3], available.get(row[0], 0)) for row in rows)],
+    }, hide_index=True, use_container_width=True)
+
+    st.subheader("Export")
+    st.write("Daily totals per barber and service for the selected dates.")
+    export_buttons("daily-stats", start_date, end_date, key="export_daily_stats")
@@ -0,0 +1,22 @@
+# views/services.py
+import streamlit as st
+import catalog
+import images
+import metrics
+
+
+@metrics.timed("page")
+def services_page():
+    st.header("Our Services")
+    services = catalog.get_catalog()
+    
+    if services:
+        for service in services.values():
+            st.subheader(service.name)
+            st.write(service.description)
+            st.write(f"Price: {service.price}")
+            if service.image_path:  # Display the image if it exists
+                path = images.variant_path(service.image_path, "display")
+                st.image(images.read_bytes(path), use_container_width=True, output_format=images.output_format(path))
+    else:
+        st.write("No services available. Please check back later.")
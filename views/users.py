@@ -0,0 +1,71 @@
+# views/users.py
+import streamlit as st
+import availability
+import metrics
+from data.users import (StrandedAppointments, get_barber_hours, get_employees, get_users, insert_employee_access,
+                        remove_employees_data, set_barber_hours)
+from ui import flash
+
+
+@metrics.timed("page")
+def user_management_page():
+    st.title("User Management")
+
+    # Display all users
+    st.subheader("All Users")
+    users = get_employees()
+    cancel_upcoming = st.checkbox("Cancel a removed barber's upcoming appointments (customers are notified)",
+                                  key="remove_user_cancel")
+
+    for user in users:
+        st.write(f"Login: {user[1]}, Name: {user[2]}, Phone: {user[3]}, Email: {user[4]}")
+        if st.button(f"Remove User {user[0]}", key=f"remove_user_{user[0]}"):
+            try:
+                remove_employees_data(user[0], cancel_upcoming)
+            except StrandedAppointments as e:
+                st.error(f"{user[1]} was not removed: {e}. Reschedule them first, or tick the box above to cancel them.")
+            else:
+                flash(f"User {user[1]} removed.")
+                st.rerun()
+
+    # Add a new user
+    st.subheader("Add New Employee")
+    ename = st.text_input("Name", key="add_name")
+    epass = st.text_input("Password", type="password", key="add_password")
+    ecell = st.text_input("Phone", key="add_phone")
+    email = st.text_input("Email", key="add_email")
+
+    if st.button("Add Employee"):
+        if ename and epass and ecell and email:
+            insert_employee_access(ename, epass, ecell, email)
+            flash("New employee added successfully!")
+            st.rerun()
+        else:
+            st.error("Please fill out all fields.")
+
+    # Working hours; a user with no working days is not offered as a barber
+    st.subheader("Working Hours")
+    users = dict(get_users())
+    barber_id = st.selectbox("Barber", list(users), format_func=users.get, key="hours_barber")
+    hours = get_barber_hours(barber_id)
+    table = {
+        "Day": list(availability.WEEKDAYS),
+        "Works": [weekday in hours for weekday in range(7)],
+        "Start": [hours.get(weekday, (availability.DEFAULT_OPENING_TIME,))[0] for weekday in range(7)],
+        "End": [hours.get(weekday, (None, availability.DEFAULT_CLOSING_TIME))[1] for weekday in range(7)],
+    }
+    edited = st.data_editor(table, hide_index=True, use_container_width=True, disabled=["Day"],
+                            key=f"hours_table_{barber_id}")
+    cancel_stranded = st.checkbox("Cancel upcoming appointments outside the new hours (customers are notified)",
+                                  key="hours_cancel")
+    if st.button("Save Working Hours"):
+        try:
+            set_barber_hours(barber_id, {weekday: (edited["Start"][weekday], edited["End"][weekday])
+                                         for weekday in range(7) if edited["Works"][weekday]}, cancel_stranded)
+        except StrandedAppointments as e:
+            st.error(f"Working hours not saved: {e}. Reschedule them first, or tick the box above to cancel them.")
+        except ValueError as e:
+            st.error(f"Invalid working hours: {e}")
+        else:
+            flash(f"Working hours for {users[barber_id]} saved.")
+            st.rerun()